@@ -17,14 +17,94 @@ Environment Variables:
     - SMTP_FROM_NAME: Name to use as sender
 """
 
+import atexit
 import logging
 import os
+import queue
 import sys
+import time
+from functools import lru_cache
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from dotenv import load_dotenv
 
+# pywin32 is only available on Windows; resolve it once so failure paths stay cheap
+try:
+    from win32com.client import gencache
+    _HAS_WIN32 = True
+except ImportError:
+    gencache = None
+    _HAS_WIN32 = False
+
+# Body of the test email, filled in with the sender's name and address
+_BODY_TEMPLATE = """TEST EMAIL
+
+From: {name} <{email}>
+
+This is a test email created using the RFQ Sender system.
+No action is required.
+        """
+
+# Outlook application object, dispatched on first use and reused afterwards
+_outlook = None
+
+
+def _get_outlook() -> Any:
+    """
+    Get the shared Outlook application object, dispatching it on first use.
+
+    Returns:
+        Outlook application object
+    """
+    global _outlook
+    if _outlook is None:
+        # Early-bound dispatch: wrappers generated from the Outlook type library
+        # (cached under gen_py) resolve property and method DISPIDs up front
+        _outlook = gencache.EnsureDispatch("Outlook.Application")
+    return _outlook
+
+
+@lru_cache(maxsize=1)
+def _project_root() -> Path:
+    """
+    Get the project root directory (parent of the scripts directory).
+
+    Returns:
+        Path to the project root, resolved once per process
+    """
+    return Path(__file__).resolve().parent.parent
+
+
+@lru_cache(maxsize=None)
+def load_environment() -> Dict[str, str]:
+    """
+    Load environment variables from the .env file, parsing it at most once per process.
+
+    Returns:
+        Snapshot of the environment taken after the .env file was loaded
+    """
+    # No ${VAR} expansion is used in .env, so skip the interpolation pass
+    load_dotenv(interpolate=False)
+    return dict(os.environ)
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that reuses the formatted timestamp for records logged within the same second."""
+
+    _cached_second = None
+    _cached_time = ""
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_time = time.strftime(datefmt or self.default_time_format, self.converter(second))
+            self._cached_second = second
+        if datefmt:
+            return self._cached_time
+        return self.default_msec_format % (self._cached_time, record.msecs)
+
 
 def setup_logging(logs_dir: str) -> logging.Logger:
     """
@@ -36,18 +116,38 @@ def setup_logging(logs_dir: str) -> logging.Logger:
     Returns:
         Logger object configured for this script
     """
-    # Ensure logs directory exists
-    os.makedirs(logs_dir, exist_ok=True)
+    # Ensure logs directory exists; a single stat covers the usual case where it does
+    if not os.path.isdir(logs_dir):
+        os.makedirs(logs_dir, exist_ok=True)
+
+    # Logging is already configured (e.g. setup_logging called twice); don't
+    # open the log file or start another listener
+    if logging.getLogger().handlers:
+        return logging.getLogger("create_test_email")
+
+    formatter = _CachedTimeFormatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    # Buffer file records in memory and write them out in one go; the file is
+    # only opened on the first flush. Errors flush immediately, and the buffer
+    # is flushed on close when logging shuts down at interpreter exit.
+    file_handler = logging.FileHandler(os.path.join(logs_dir, "create_test_email.log"), delay=True)
+    file_handler.setFormatter(formatter)
+    memory_handler = MemoryHandler(1024, flushLevel=logging.ERROR, target=file_handler)
+
+    # Callers only enqueue records; a background thread hands them to the real
+    # handlers so console and disk I/O never block the COM calls
+    queue_handler = QueueHandler(queue.Queue(-1))
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(queue_handler.queue, stream_handler, memory_handler, respect_handler_level=True)
+    listener.start()
+    # Registered after logging's own shutdown hook, so it runs first and drains the queue
+    atexit.register(listener.stop)
 
     # Set up logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler(os.path.join(logs_dir, "create_test_email.log")),
-        ],
-    )
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
     return logging.getLogger("create_test_email")
 
 
@@ -64,17 +164,20 @@ def create_outlook_draft(to_email: str, subject: str, body: str, logger: logging
     Returns:
         bool: True if successful, False otherwise
     """
-    try:
-        # Import win32com here to avoid issues if it's not installed
-        import win32com.client
+    if not _HAS_WIN32:
+        logger.error("win32com is not installed. Please install it with: pip install pywin32")
+        return False
 
-        # Create Outlook application object
-        outlook = win32com.client.Dispatch("Outlook.Application")
+    try:
+        # Reuse the Outlook application object across drafts
+        outlook = _get_outlook()
 
         # Create a new email
         mail = outlook.CreateItem(0)  # 0 = olMailItem
 
-        # Set email properties
+        # Set email properties. These stay as object-model assignments rather than
+        # one PropertyAccessor.SetProperties call: PR_DISPLAY_TO is computed from the
+        # Recipients table, so setting it through MAPI would not add a recipient.
         mail.To = to_email
         mail.Subject = subject
         mail.Body = body
@@ -85,9 +188,6 @@ def create_outlook_draft(to_email: str, subject: str, body: str, logger: logging
         logger.info(f"Created draft email to {to_email}")
         return True
 
-    except ImportError:
-        logger.error("win32com is not installed. Please install it with: pip install pywin32")
-        return False
     except Exception as e:
         logger.error(f"Failed to create draft email: {str(e)}")
         return False
@@ -108,7 +208,7 @@ def get_env_variable(var_name: str, default: Optional[str] = None, logger: loggi
     Raises:
         ValueError: If environment variable is not set and no default is provided
     """
-    value = os.environ.get(var_name, default)
+    value = load_environment().get(var_name, default)
 
     if value is None:
         error_msg = f"Environment variable {var_name} is not set and no default provided"
@@ -122,15 +222,13 @@ def get_env_variable(var_name: str, default: Optional[str] = None, logger: loggi
 def main() -> None:
     """Main entry point for the script."""
     try:
-        # Get the project root directory (parent of scripts directory)
-        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        logs_dir = os.path.join(project_root, "logs")
+        logs_dir = str(_project_root() / "logs")
 
         # Set up logging
         logger = setup_logging(logs_dir)
 
         # Load environment variables from .env file
-        load_dotenv()
+        load_environment()
         logger.info("Loaded environment variables from .env file")
 
         # Get email configuration from environment variables with validation
@@ -148,13 +246,7 @@ def main() -> None:
         # Create test email
         to_email = "example@example.com"
         subject = "TEST"
-        body = f"""TEST EMAIL
-
-From: {from_name} <{from_email}>
-
-This is a test email created using the RFQ Sender system.
-No action is required.
-        """
+        body = _BODY_TEMPLATE.format(name=from_name, email=from_email)
 
         logger.info(f"Creating test email from {from_email} to {to_email}")
 
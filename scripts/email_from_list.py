@@ -25,7 +25,13 @@ import logging
 import os
 import sys
 import csv
-from typing import Dict, List, Optional, Tuple, Any
+import datetime
+import html
+import io
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Any
 
 import pandas as pd
 import win32com.client as win32
@@ -33,6 +39,57 @@ import yaml
 import jinja2
 from pandas import DataFrame
 
+# Use the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Outlook enumeration values (OlItemType, OlBodyFormat)
+OL_MAIL_ITEM = 0
+OL_FORMAT_PLAIN = 1
+OL_FORMAT_HTML = 2
+
+# HTML fragments of the sample table. A row holds the five queue values followed
+# by five empty cells for the vendor to fill in.
+_SAMPLE_TABLE_HEADER_CELL = '<th style="border: 1px solid #ddd; padding: 8px; text-align: left;">{}</th>'
+_SAMPLE_TABLE_CELL = '<td style="border: 1px solid #ddd; padding: 8px;">{}</td>'
+_SAMPLE_TABLE_ROW = '<tr>' + _SAMPLE_TABLE_CELL * 5 + _SAMPLE_TABLE_CELL.format('') * 5 + '</tr>'
+
+# Extensions of queue folder files that are never attached (Excel and Word documents)
+IGNORED_ATTACHMENT_EXTENSIONS = ('.xlsx', '.xls', '.docx', '.doc')
+
+# Columns of the email log CSV, in the order log_email records them
+EMAIL_LOG_COLUMNS = ['quote_id', 'vendor_id', 'sent_timestamp', 'status']
+
+
+@dataclass
+class VendorInfo:
+    """
+    Contact details and capabilities of a vendor.
+
+    Slots keep the per-vendor footprint small and attribute access fast. They are
+    declared by hand because dataclass(slots=True) needs Python 3.10.
+
+    Attributes:
+        email: Email address of the vendor's primary contact
+        vendor_name: Name of the vendor as listed in the contacts file
+        first_name: First name of the contact, for the greeting (may be empty)
+        processes: Process entries from vendor_options.yaml (names or dicts with specs)
+    """
+    __slots__ = ('email', 'vendor_name', 'first_name', 'processes')
+
+    email: str
+    vendor_name: str
+    first_name: str
+    processes: List[Any]
+
+
+# Fallback for callers that don't pass a logger. The NullHandler keeps the module
+# silent until setup_logging (or the embedding application) configures handlers.
+_default_logger = logging.getLogger("email_from_list")
+_default_logger.addHandler(logging.NullHandler())
+
 
 def setup_logging(logs_dir: str) -> logging.Logger:
     """
@@ -59,7 +116,7 @@ def setup_logging(logs_dir: str) -> logging.Logger:
     return logging.getLogger("email_from_list")
 
 
-def load_data(queue_file: str, contacts_file: str, vendor_options_file: str, logger: logging.Logger = None) -> Tuple[DataFrame, Dict[Any, Dict[str, Any]]]:
+def load_data(queue_file: str, contacts_file: str, vendor_options_file: str, logger: logging.Logger = None) -> Tuple[DataFrame, Dict[Any, VendorInfo]]:
     """
     Load data from CSV and YAML files and prepare vendor information.
 
@@ -72,64 +129,37 @@ def load_data(queue_file: str, contacts_file: str, vendor_options_file: str, log
         queue_file: Path to the queue CSV file (Queue.csv)
         contacts_file: Path to the contacts CSV file (contacts.csv)
         vendor_options_file: Path to the vendor options YAML file (vendor_options.yaml)
-        logger: Optional logger for logging messages
+        logger: Optional logger; defaults to the module logger
 
     Returns:
         Tuple containing:
             - DataFrame with queue data (with renamed columns)
-            - Dictionary mapping vendor_id to vendor information (email and name)
+            - Dictionary mapping vendor_id to VendorInfo
 
     Raises:
         FileNotFoundError: If any of the required files don't exist
         ValueError: If the files don't have the expected structure
     """
-    if logger:
-        logger.info(f"Loading queue data from {queue_file}")
-    else:
-        print(f"Loading queue data from {queue_file}")
+    logger = logger or _default_logger
+    logger.info(f"Loading queue data from {queue_file}")
 
     if not os.path.exists(queue_file):
-        if logger:
-            logger.error(f"Queue file not found: {queue_file}")
-        else:
-            print(f"Queue file not found: {queue_file}")
+        logger.error(f"Queue file not found: {queue_file}")
         raise FileNotFoundError(f"Queue file not found: {queue_file}")
 
-    if logger:
-        logger.info(f"Loading contacts data from {contacts_file}")
-    else:
-        print(f"Loading contacts data from {contacts_file}")
+    logger.info(f"Loading contacts data from {contacts_file}")
 
     if not os.path.exists(contacts_file):
-        if logger:
-            logger.error(f"Contacts file not found: {contacts_file}")
-        else:
-            print(f"Contacts file not found: {contacts_file}")
+        logger.error(f"Contacts file not found: {contacts_file}")
         raise FileNotFoundError(f"Contacts file not found: {contacts_file}")
 
-    if logger:
-        logger.info(f"Loading vendor options from {vendor_options_file}")
-    else:
-        print(f"Loading vendor options from {vendor_options_file}")
+    logger.info(f"Loading vendor options from {vendor_options_file}")
 
     if not os.path.exists(vendor_options_file):
-        if logger:
-            logger.error(f"Vendor options file not found: {vendor_options_file}")
-        else:
-            print(f"Vendor options file not found: {vendor_options_file}")
+        logger.error(f"Vendor options file not found: {vendor_options_file}")
         raise FileNotFoundError(f"Vendor options file not found: {vendor_options_file}")
 
     try:
-        # Load queue data with Windows encoding fallback
-        queue = pd.read_csv(queue_file, encoding='cp1252')
-
-        # Load contacts data
-        contacts = pd.read_csv(contacts_file, encoding='cp1252')
-
-        # Load vendor options data
-        with open(vendor_options_file, 'r', encoding='utf-8') as f:
-            vendor_options = yaml.safe_load(f)
-
         # Rename queue columns to match expected names
         queue_column_mapping = {
             'Quote#': 'quote_id',
@@ -141,17 +171,52 @@ def load_data(queue_file: str, contacts_file: str, vendor_options_file: str, log
             'PriceBreak': 'qty',
             'File_location': 'file_path'
         }
+        # Only parse the columns we use (under either their CSV or renamed names),
+        # all as text so pandas skips dtype inference
+        queue_columns = set(queue_column_mapping) | set(queue_column_mapping.values())
+
+        # Load queue data with Windows encoding fallback
+        queue = pd.read_csv(
+            queue_file,
+            encoding='cp1252',
+            engine='c',
+            usecols=lambda column: column in queue_columns,
+            dtype=str
+        )
+
+        # Load contacts data, as text and without the columns that are never used.
+        # The 'Primary' marker sits in an unnamed column, so the other columns are
+        # kept and searched below.
+        unused_contact_columns = {'Contact', 'Last', 'Phone', 'State'}
+        contacts = pd.read_csv(
+            contacts_file,
+            encoding='cp1252',
+            engine='c',
+            usecols=lambda column: column not in unused_contact_columns,
+            dtype=str
+        )
+
+        # Load vendor options data
+        # Read as bytes so libyaml decodes the UTF-8 itself
+        with open(vendor_options_file, 'rb') as f:
+            vendor_options = yaml.load(f, Loader=SafeLoader)
+
         queue = queue.rename(columns=queue_column_mapping)
 
+        # Normalize the text once: strip every column and use empty strings for
+        # missing optional values, so later code can test values by truthiness.
+        # Keys stay NaN when missing so those rows still drop out of the grouping.
+        queue = queue.apply(lambda column: column.str.strip())
+        optional_columns = [col for col in ('line', 'callout', 'spec', 'qty', 'file_path') if col in queue.columns]
+        queue[optional_columns] = queue[optional_columns].fillna('')
+
         # Process contacts data
         # Filter to primary contacts only
         # The 'Primary' value is in the 9th column which might be unnamed in the CSV
-        # Find the column that contains 'Primary' values
-        primary_column = None
-        for col in contacts.columns:
-            if 'Primary' in contacts[col].values:
-                primary_column = col
-                break
+        # Find the first column that contains 'Primary' values, comparing the
+        # whole table in one pass
+        has_primary = (contacts == 'Primary').any(axis=0)
+        primary_column = has_primary.idxmax() if has_primary.any() else None
 
         # Filter to primary contacts in the finishing category
         if primary_column:
@@ -161,23 +226,22 @@ def load_data(queue_file: str, contacts_file: str, vendor_options_file: str, log
             primary_contacts = contacts[contacts['type'] == 'finishing']
 
         # Create vendor info dictionary
-        vendor_info = {}
-        for _, row in primary_contacts.iterrows():
-            vendor_id = row['Vendor'].strip()
-            email = row['Email'].strip() if pd.notna(row['Email']) else ""
-
-            # Skip entries without email
-            if not email:
-                continue
-
-            # Get the first name if available
-            first_name = row['First'].strip() if pd.notna(row['First']) else ""
-
-            vendor_info[vendor_id] = {
-                'email': email,
-                'vendor_name': vendor_id,  # Use vendor name as is
-                'first_name': first_name  # Add first name for personalized greeting
-            }
+        # Strip the contact fields column-wise, then skip entries without email
+        emails = primary_contacts['Email'].fillna('').astype(str).str.strip()
+        has_email = emails != ''
+        vendor_ids = primary_contacts['Vendor'].str.strip()[has_email]
+        # Get the first name if available
+        first_names = primary_contacts['First'].fillna('').astype(str).str.strip()[has_email]
+
+        vendor_info = {
+            vendor_id: VendorInfo(
+                email=email,
+                vendor_name=vendor_id,  # Use vendor name as is
+                first_name=first_name,  # Add first name for personalized greeting
+                processes=[]
+            )
+            for vendor_id, email, first_name in zip(vendor_ids, emails[has_email], first_names)
+        }
 
         # Enrich vendor info with capabilities from vendor_options
         if vendor_options and 'vendors' in vendor_options:
@@ -187,13 +251,10 @@ def load_data(queue_file: str, contacts_file: str, vendor_options_file: str, log
                     # Add capabilities information
                     if 'processes' in vendor:
                         # Store the full process objects, ensuring it's not None
-                        vendor_info[vendor_name]['processes'] = vendor['processes'] if vendor['processes'] is not None else []
+                        vendor_info[vendor_name].processes = vendor['processes'] if vendor['processes'] is not None else []
 
     except Exception as e:
-        if logger:
-            logger.error(f"Error loading files: {str(e)}")
-        else:
-            print(f"Error loading files: {str(e)}")
+        logger.error(f"Error loading files: {str(e)}")
         raise
 
     # Validate required columns in queue
@@ -201,47 +262,109 @@ def load_data(queue_file: str, contacts_file: str, vendor_options_file: str, log
     missing_queue_columns = [col for col in required_queue_columns if col not in queue.columns]
 
     if missing_queue_columns:
-        if logger:
-            logger.error(f"Queue file missing required columns: {', '.join(missing_queue_columns)}")
-        else:
-            print(f"Queue file missing required columns: {', '.join(missing_queue_columns)}")
+        logger.error(f"Queue file missing required columns: {', '.join(missing_queue_columns)}")
         raise ValueError(f"Queue file missing required columns: {', '.join(missing_queue_columns)}")
 
     # Check if we have any vendor info
     if not vendor_info:
-        if logger:
-            logger.warning("No vendor information found in contacts file")
-        else:
-            print("No vendor information found in contacts file")
+        logger.warning("No vendor information found in contacts file")
 
     return queue, vendor_info
 
 
+@lru_cache(maxsize=1)
+def get_outlook() -> Any:
+    """
+    Get the Outlook application object, activating it on first use.
+
+    The COM activation is done once and the same object is handed to every
+    caller until release_outlook is called.
+
+    Returns:
+        Outlook application object
+    """
+    # Early-bound dispatch: the typed wrappers generated from Outlook's type
+    # library (makepy output, cached under gen_py after the first run) call
+    # properties and methods by DISPID instead of looking names up each time
+    return win32.gencache.EnsureDispatch('Outlook.Application')
+
+
+def release_outlook() -> None:
+    """
+    Drop the shared Outlook application object (e.g. between tests).
+
+    The next initialize_outlook call activates Outlook again.
+    """
+    get_outlook.cache_clear()
+
+
 def initialize_outlook(logger: logging.Logger = None) -> Any:
     """
     Initialize the Outlook application.
 
+    Args:
+        logger: Optional logger; defaults to the module logger
+
     Returns:
-        Outlook application object
+        Outlook application object, shared across calls (see get_outlook)
 
     Raises:
         RuntimeError: If Outlook cannot be initialized
     """
-    if logger:
-        logger.info("Initializing Outlook")
-    else:
-        print("Initializing Outlook")
+    logger = logger or _default_logger
+    logger.info("Initializing Outlook")
     try:
-        outlook = win32.Dispatch('outlook.application')
-        return outlook
+        return get_outlook()
     except Exception as e:
-        if logger:
-            logger.error(f"Failed to initialize Outlook: {str(e)}")
-        else:
-            print(f"Failed to initialize Outlook: {str(e)}")
+        logger.error(f"Failed to initialize Outlook: {str(e)}")
         raise RuntimeError(f"Failed to initialize Outlook: {str(e)}")
 
 
+@lru_cache(maxsize=16)
+def get_template_environment(template_dir: str) -> jinja2.Environment:
+    """
+    Get the Jinja2 environment for a template directory, creating it on first use.
+
+    The environment keeps its compiled templates, so each template is only
+    parsed once per run no matter how many emails are rendered from it.
+
+    Args:
+        template_dir: Directory containing the templates
+
+    Returns:
+        Jinja2 environment loading templates from template_dir
+    """
+    env = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(template_dir),
+        autoescape=jinja2.select_autoescape(['html', 'xml'])
+    )
+
+    # Add custom filter for getting basename of a path; the same attachments
+    # are listed in many emails, so the results are memoized
+    env.filters['basename'] = lru_cache(maxsize=4096)(os.path.basename)
+
+    return env
+
+
+@lru_cache(maxsize=16)
+def get_template(template_path: str) -> jinja2.Template:
+    """
+    Get the compiled Jinja2 template for a path, loading it on first use.
+
+    Holding on to the template also skips the environment's per-lookup check
+    of the file's modification time.
+
+    Args:
+        template_path: Path to the template file
+
+    Returns:
+        Compiled Jinja2 template
+    """
+    template_dir = os.path.dirname(template_path)
+    template_file = os.path.basename(template_path)
+    return get_template_environment(template_dir).get_template(template_file)
+
+
 def render_template(template_path: str, context: Dict[str, Any]) -> str:
     """
     Render a Jinja2 template with the given context.
@@ -253,31 +376,32 @@ def render_template(template_path: str, context: Dict[str, Any]) -> str:
     Returns:
         Rendered template as a string
     """
-    template_dir = os.path.dirname(template_path)
-    template_file = os.path.basename(template_path)
+    return get_template(template_path).render(**context)
 
-    # Set up Jinja2 environment
-    env = jinja2.Environment(
-        loader=jinja2.FileSystemLoader(template_dir),
-        autoescape=jinja2.select_autoescape(['html', 'xml'])
-    )
 
-    # Add custom filter for getting basename of a path
-    env.filters['basename'] = os.path.basename
+def read_sample_table_header(template_path: str) -> List[str]:
+    """
+    Read the header row of a sample table template.
 
-    # Load and render the template
-    template = env.get_template(template_file)
-    return template.render(**context)
+    Args:
+        template_path: Path to the sample table template
+
+    Returns:
+        List of column names from the template's header row
+    """
+    with open(template_path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        return next(reader)
 
 
-def create_sample_table(items: DataFrame, process: str, template_path: str, html_format: bool = True) -> str:
+def create_sample_table(items: DataFrame, process: str, header: List[str], html_format: bool = True) -> str:
     """
     Create a table for the given items and process.
 
     Args:
         items: DataFrame containing items for the quote
         process: Process to filter items by
-        template_path: Path to the sample table template
+        header: Column names from the sample table template (see read_sample_table_header)
         html_format: Whether to format the table as HTML (True) or CSV (False)
 
     Returns:
@@ -286,100 +410,121 @@ def create_sample_table(items: DataFrame, process: str, template_path: str, html
     # Filter items by process
     process_items = items[items['process'] == process]
 
-    # Read the template
-    with open(template_path, 'r', newline='') as f:
-        reader = csv.reader(f)
-        header = next(reader)  # Get header row
-
     if html_format:
         # Create an HTML table with proper styling
         html_table = ['<table style="border-collapse: collapse; width: 100%;">']
 
         # Add header row
         html_table.append('<tr style="background-color: #f2f2f2; font-weight: bold;">')
-        for col in header:
-            html_table.append(f'<th style="border: 1px solid #ddd; padding: 8px; text-align: left;">{col}</th>')
+        html_table.extend(_SAMPLE_TABLE_HEADER_CELL.format(col) for col in header)
         html_table.append('</tr>')
 
         # Add data rows
-        for _, row in process_items.iterrows():
-            html_table.append('<tr>')
-            # Part Number
-            html_table.append(f'<td style="border: 1px solid #ddd; padding: 8px;">{row["part_number"]}</td>')
+        # Part Number, Print Callout, Process, Spec and QTYs come from the queue
+        # (missing values become empty cells); the vendor fills in the rest
+        rows = process_items.reindex(columns=['part_number', 'callout', 'process', 'spec', 'qty']).fillna('').to_numpy()
+        html_table.extend(_SAMPLE_TABLE_ROW.format(*row) for row in rows)
 
-            # Print Callout - Use the callout field from the queue
-            callout_val = row["callout"] if pd.notna(row.get("callout")) else ""
-            html_table.append(f'<td style="border: 1px solid #ddd; padding: 8px;">{callout_val}</td>')
+        html_table.append('</table>')
 
-            # Process - Use the process field from the queue
-            process_val = row["process"] if pd.notna(row.get("process")) else ""
-            html_table.append(f'<td style="border: 1px solid #ddd; padding: 8px;">{process_val}</td>')
 
-            # Spec - Use the spec field from the queue
-            spec_val = row["spec"] if pd.notna(row.get("spec")) else ""
-            html_table.append(f'<td style="border: 1px solid #ddd; padding: 8px;">{spec_val}</td>')
+        return ''.join(html_table)
+    else:
+        # Create a CSV table (original behavior)
+        # Part Number, Print Callout, Process, Spec and QTYs come from the queue
+        # (missing values become empty cells); the vendor fills in the rest
+        rows = process_items.reindex(columns=['part_number', 'callout', 'process', 'spec', 'qty']).assign(
+            unit_price='', line_minimum='', order_minimum='', lead_time='', vendor_ref=''
+        )
 
-            # QTYs - Use the qty field from the queue
-            qty_val = row["qty"] if pd.notna(row.get("qty")) else ""
-            html_table.append(f'<td style="border: 1px solid #ddd; padding: 8px;">{qty_val}</td>')
+        output = io.StringIO()
+        output.write(','.join(header))  # Add a header row
+        output.write('\n')
+        rows.to_csv(output, header=False, index=False, lineterminator='\n')
 
-            # Unit_Price (empty)
-            html_table.append('<td style="border: 1px solid #ddd; padding: 8px;"></td>')
+        return output.getvalue().rstrip('\n')
 
-            # Line Minimum (empty)
-            html_table.append('<td style="border: 1px solid #ddd; padding: 8px;"></td>')
 
-            # Order Minimum (empty)
-            html_table.append('<td style="border: 1px solid #ddd; padding: 8px;"></td>')
+@lru_cache(maxsize=8)
+def format_signature_html(signature: str) -> str:
+    """
+    Convert a plain-text signature to an HTML paragraph.
 
-            # Lead_Time (empty)
-            html_table.append('<td style="border: 1px solid #ddd; padding: 8px;"></td>')
+    The signature is the same for every email in a run, so the conversion is
+    cached rather than redone per email.
 
-            # vendor_ref_# (empty)
-            html_table.append('<td style="border: 1px solid #ddd; padding: 8px;"></td>')
+    Args:
+        signature: Plain-text email signature
 
-            html_table.append('</tr>')
+    Returns:
+        Signature as an HTML paragraph with line breaks
+    """
+    return "<p>" + signature.replace('\n', '<br>') + "</p>"
 
-        html_table.append('</table>')
 
+def format_plain_item_lines(items: DataFrame) -> List[str]:
+    """
+    Build the plain-text part lines of an email body.
 
-        return ''.join(html_table)
-    else:
-        # Create a CSV table (original behavior)
-        output = []
-        output.append(','.join(header))  # Add a header row
-
-        # Add rows for each item
-        for _, row in process_items.iterrows():
-            # Use callout field for Print Callout column
-            callout_val = row["callout"] if pd.notna(row.get("callout")) else ""
-            # Use process field for Process column
-            process_val = row["process"] if pd.notna(row.get("process")) else ""
-            # Use spec field for Spec column
-            spec_val = row["spec"] if pd.notna(row.get("spec")) else ""
-            # Use qty field for QTYs column
-            qty_val = row["qty"] if pd.notna(row.get("qty")) else ""
-
-            csv_row = [
-                row['part_number'],
-                callout_val,
-                process_val,
-                spec_val,
-                qty_val,
-                '',  # Unit_Price (empty)
-                '',  # Line Minimum (empty)
-                '',  # Order Minimum (empty)
-                '',  # Lead_Time (empty)
-                ''   # vendor_ref_# (empty)
-            ]
-            output.append(','.join(csv_row))
-
-
-        return '\n'.join(output)
+    Each line lists the part, quantity, process and (when not empty) spec,
+    followed by the item's callout as a quoted block. The lines are assembled with
+    vectorized pandas string operations rather than one f-string per row.
+
+    Args:
+        items: DataFrame containing the items to list
+
+    Returns:
+        List with one formatted line per item
+    """
+    def text(column: str) -> pd.Series:
+        if column not in items.columns:
+            return pd.Series('', index=items.index, dtype=object)
+        return items[column].fillna('').astype(str)
+
+    lines = "- Part: " + text('part_number') + ", Qty: " + text('qty') + ", Process: " + text('process')
+
+    # Add spec if available
+    if 'spec' in items.columns:
+        spec = text('spec')
+        lines += (", Spec: " + spec).where(spec != '', '')
+
+    # Add callout as a quoted block if available, escaping any existing quotes
+    if 'callout' in items.columns:
+        callout = text('callout')
+        callout_text = callout.str.replace('"', '\\"', regex=False)
+        lines += ("\n  Callout: \"" + callout_text + "\"").where(callout != '', '')
+
+    return lines.tolist()
+
+
+def calculate_due_date(days: int = 7) -> str:
+    """
+    Calculate the date quotes are due back, formatted for the email.
+
+    Args:
+        days: Number of days from now the quotes are due
+
+    Returns:
+        Due date formatted like "January 01, 2025"
+    """
+    return (datetime.datetime.now() + datetime.timedelta(days=days)).strftime("%B %d, %Y")
+
+
+def is_html_signature(signature: Optional[str]) -> bool:
+    """
+    Check whether a signature is HTML markup that can be appended as is.
+
+    Args:
+        signature: Email signature, if any
+
+    Returns:
+        True if the signature starts with an HTML tag
+    """
+    return bool(signature) and signature.strip().startswith('<')
 
 
 def create_email_body(
-    vendor_info: Dict[str, Any], 
+    vendor_info: VendorInfo, 
     items: DataFrame, 
     process: str = None, 
     use_template: bool = False,
@@ -387,7 +532,10 @@ def create_email_body(
     sample_table_path: str = None,
     signature: str = None,
     html_format: bool = True,
-    actual_attachments: List[str] = None
+    actual_attachments: List[str] = None,
+    due_date: Optional[str] = None,
+    signature_is_html: Optional[bool] = None,
+    sample_header: Optional[List[str]] = None
 ) -> Tuple[str, str]:
     """
     Create email subject and body for an RFQ.
@@ -398,27 +546,29 @@ def create_email_body(
     The email can be formatted as HTML or plain text.
 
     Args:
-        vendor_info: Dictionary containing vendor information (name, email, first_name)
+        vendor_info: Information about the vendor the email is for
         items: DataFrame containing items for the quote, with columns like
                'quote_id', 'part_number', 'qty', 'process', 'spec', and 'callout'
         process: Process to filter items by (if None, includes all items)
-        use_template: Whether to use the Jinja2 template
+        use_template: Whether to use the Jinja2 template (the caller checks that it exists)
         template_path: Path to the Jinja2 template
-        sample_table_path: Path to the sample table template
+        sample_table_path: Path to an existing sample table template (None for no table)
         signature: Email signature to include
         html_format: Whether to format the email as HTML (True) or plain text (False)
         actual_attachments: List of actual file paths that will be attached to the email
+        due_date: Formatted quote due date; calculated when not given
+        signature_is_html: Whether the signature is HTML markup; detected when not given
+        sample_header: Header of the sample table template; read from
+            sample_table_path when not given
 
     Returns:
         Tuple containing:
             - Email subject
             - Email body (HTML or plain text)
     """
-    import datetime
-
     quote_id = items['quote_id'].iloc[0]
-    vendor_name = vendor_info['vendor_name']
-    first_name = vendor_info.get('first_name', '')
+    vendor_name = vendor_info.vendor_name
+    first_name = vendor_info.first_name
 
     # Use first name if available, otherwise use vendor name
     greeting_name = first_name if first_name else vendor_name
@@ -431,28 +581,39 @@ def create_email_body(
         filtered_items = items
         subject = f"RFQ for Quote {quote_id}"
 
-    # Calculate due date (7 days from now)
-    due_date = (datetime.datetime.now() + datetime.timedelta(days=7)).strftime("%B %d, %Y")
+    # Read the sample table header unless the caller already did
+    if sample_header is None and sample_table_path:
+        sample_header = read_sample_table_header(sample_table_path)
+
+    # Calculate due date (7 days from now) unless the caller already did
+    if due_date is None:
+        due_date = calculate_due_date()
 
-    if use_template and template_path and os.path.exists(template_path):
+    if use_template and template_path:
         # Create sample table if specified
         sample_table = None
-        if sample_table_path and os.path.exists(sample_table_path):
-            sample_table = create_sample_table(filtered_items, process, sample_table_path, html_format)
+        if sample_header:
+            sample_table = create_sample_table(filtered_items, process, sample_header, html_format)
+
+        # The template shows the first spec given for the items, if any
+        spec = None
+        if 'spec' in filtered_items.columns:
+            spec = next((item_spec for item_spec in filtered_items['spec'] if item_spec), None)
 
         # Use Jinja2 template
-        # Prepare context for the template
+        # Prepare context for the template; distinct values are taken straight
+        # from the column arrays, and the process list only when no process is given
         context = {
             'vendor': {
                 'name': vendor_name,
                 'first_name': first_name
             },
             'greeting_name': greeting_name,
-            'part_no': ', '.join(filtered_items['part_number'].unique()),
-            'process': process or ', '.join(filtered_items['process'].unique()),
-            'spec': filtered_items['spec'].iloc[0] if 'spec' in filtered_items.columns and not filtered_items['spec'].isna().all() else None,
-            'quantities': filtered_items['qty'].unique().tolist() if 'qty' in filtered_items.columns else [],
-            'attachments': actual_attachments if actual_attachments is not None else (filtered_items['file_path'].dropna().unique().tolist() if 'file_path' in filtered_items.columns else []),
+            'part_no': ', '.join(pd.unique(filtered_items['part_number'].to_numpy())),
+            'process': process or ', '.join(pd.unique(filtered_items['process'].to_numpy())),
+            'spec': spec,
+            'quantities': pd.unique(filtered_items['qty'].to_numpy()).tolist() if 'qty' in filtered_items.columns else [],
+            'attachments': actual_attachments if actual_attachments is not None else ([path for path in filtered_items['file_path'].unique() if path] if 'file_path' in filtered_items.columns else []),
             'due_date': due_date,  # Use the calculated due date
             'sender_name': "Your Name",  # Default values, will be overridden by HTML signature
             'sender_email': "your.email@example.com",
@@ -464,7 +625,9 @@ def create_email_body(
         body = render_template(template_path, context)
 
         # Append HTML signature if provided
-        if signature and html_format and signature.strip().startswith('<'):
+        if signature_is_html is None:
+            signature_is_html = is_html_signature(signature)
+        if html_format and signature_is_html:
             # Append the HTML signature
             body = body + signature
     else:
@@ -476,21 +639,22 @@ def create_email_body(
             html_parts.append("<ul>")
 
             # Create detailed lines for each part
-            for r in filtered_items.itertuples():
-                part_html = f"<li><strong>Part:</strong> {r.part_number}, <strong>Qty:</strong> {r.qty}, <strong>Process:</strong> {r.process}"
+            # Fill gaps and HTML-escape the callouts column-wise before the loop
+            rows = filtered_items.reindex(columns=['part_number', 'qty', 'process', 'spec', 'callout']).fillna('')
+            callouts = rows['callout'].astype(str).map(html.escape)
+            for part_number, qty, item_process, spec, callout_text in zip(
+                rows['part_number'], rows['qty'], rows['process'], rows['spec'], callouts
+            ):
+                part_html = f"<li><strong>Part:</strong> {part_number}, <strong>Qty:</strong> {qty}, <strong>Process:</strong> {item_process}"
 
                 # Add spec if available
-                if hasattr(r, 'spec') and pd.notna(r.spec):
-                    part_html += f", <strong>Spec:</strong> {r.spec}"
+                if spec:
+                    part_html += f", <strong>Spec:</strong> {spec}"
 
                 part_html += "</li>"
 
                 # Add callout as a quoted block if available
-                if hasattr(r, 'callout') and pd.notna(r.callout):
-                    callout_text = r.callout.strip()
-                    # HTML-escape the callout text
-                    callout_text = callout_text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
-                    # Add the callout as a blockquote
+                if callout_text:
                     part_html += f'<blockquote style="margin-left: 20px; padding-left: 10px; border-left: 3px solid #ccc;">{callout_text}</blockquote>'
 
                 html_parts.append(part_html)
@@ -498,39 +662,21 @@ def create_email_body(
             html_parts.append("</ul>")
 
             # Add sample table if specified
-            if sample_table_path and os.path.exists(sample_table_path):
-                sample_table = create_sample_table(filtered_items, process, sample_table_path, html_format=True)
+            if sample_header:
+                sample_table = create_sample_table(filtered_items, process, sample_header, html_format=True)
                 html_parts.append("<p>Please fill out the following table and return it to us:</p>")
                 html_parts.append(sample_table)
 
             # Add signature
             if signature:
-                newline = '\n'  # Define newline character outside the f-string
-                html_parts.append(f"<p>{signature.replace(newline, '<br>')}</p>")
+                html_parts.append(format_signature_html(signature))
             else:
                 html_parts.append("<p>Thanks,<br>Your Name</p>")
 
             body = "".join(html_parts)
         else:
             # Create plain text content (original behavior)
-            lines = []
-            for r in filtered_items.itertuples():
-                part_line = f"- Part: {r.part_number}, Qty: {r.qty}, Process: {r.process}"
-
-                # Add spec if available
-                if hasattr(r, 'spec') and pd.notna(r.spec):
-                    part_line += f", Spec: {r.spec}"
-
-                # Add callout as a quoted block if available
-                if hasattr(r, 'callout') and pd.notna(r.callout):
-                    # Format the callout with proper indentation and quotes
-                    callout_text = r.callout.strip()
-                    # Replace any existing quotes with escaped quotes
-                    callout_text = callout_text.replace('"', '\\"')
-                    # Add the callout as a quoted block
-                    part_line += f"\n  Callout: \"{callout_text}\""
-
-                lines.append(part_line)
+            lines = format_plain_item_lines(filtered_items)
 
             body = (
                 f"Hello {greeting_name},\n\n"
@@ -539,8 +685,8 @@ def create_email_body(
             )
 
             # Add sample table if specified
-            if sample_table_path and os.path.exists(sample_table_path):
-                sample_table = create_sample_table(filtered_items, process, sample_table_path, html_format=False)
+            if sample_header:
+                sample_table = create_sample_table(filtered_items, process, sample_header, html_format=False)
                 body += f"\n\nPlease fill out the following table and return it to us:\n\n{sample_table}"
 
             # Add signature
@@ -552,6 +698,22 @@ def create_email_body(
     return subject, body
 
 
+def is_existing_file(path: str) -> bool:
+    """
+    Check whether a path is an existing file.
+
+    The answer comes from the cached listing of the path's directory, so the
+    attachments of every draft are checked with one os.scandir per folder.
+
+    Args:
+        path: Path to check
+
+    Returns:
+        True if the path is an existing file
+    """
+    return get_path_kind(path) == 'file'
+
+
 def create_draft_email(
     outlook: Any, 
     recipient: str, 
@@ -571,22 +733,23 @@ def create_draft_email(
         subject: Email subject
         body: Email body (HTML or plain text)
         attachments: List of file paths to attach
-        logger: Optional logger for logging messages
+        logger: Optional logger; defaults to the module logger
         html_format: Whether the body is HTML (True) or plain text (False)
         use_outlook_signature: Whether to use Outlook's general signature
 
     Returns:
         bool: True if successful, False otherwise
     """
+    logger = logger or _default_logger
     try:
         # Create draft
-        mail = outlook.CreateItem(0)  # 0 = olMailItem
+        mail = outlook.CreateItem(OL_MAIL_ITEM)
         mail.To = recipient
         mail.Subject = subject
 
         # Set the body format to HTML or plain text
         if html_format:
-            mail.BodyFormat = 2  # 2 = olFormatHTML
+            mail.BodyFormat = OL_FORMAT_HTML
 
             # If using Outlook's signature, we need to get the inspector first
             if use_outlook_signature:
@@ -602,84 +765,361 @@ def create_draft_email(
                 mail.HTMLBody = body
         else:
             # Use plain text format
-            mail.BodyFormat = 1  # 1 = olFormatPlain
+            mail.BodyFormat = OL_FORMAT_PLAIN
             mail.Body = body
 
-        # Attach files
+        # Attach files through one Attachments collection object
+        mail_attachments = mail.Attachments
         missing_attachments = []
+        # Debug output is normally off; check the level once for the whole loop
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         for path in attachments:
-            if os.path.isfile(path):
-                mail.Attachments.Add(path)
-                if logger:
-                    logger.debug(f"Attached file: {path}")
-                else:
-                    print(f"Attached file: {path}")
+            if is_existing_file(path):
+                mail_attachments.Add(path)
+                if debug_enabled:
+                    logger.debug("Attached file: %s", path)
             else:
-                if logger:
-                    logger.warning(f"Missing attachment: {path}")
-                else:
-                    print(f"Missing attachment: {path}")
+                logger.warning(f"Missing attachment: {path}")
                 missing_attachments.append(path)
 
         mail.Save()
 
         if missing_attachments:
-            if logger:
-                logger.warning(f"Email saved with {len(missing_attachments)} missing attachments")
-            else:
-                print(f"Email saved with {len(missing_attachments)} missing attachments")
+            logger.warning(f"Email saved with {len(missing_attachments)} missing attachments")
             return False
 
         return True
 
     except Exception as e:
-        if logger:
-            logger.error(f"Error creating draft email: {str(e)}")
-        else:
-            print(f"Error creating draft email: {str(e)}")
+        logger.error(f"Error creating draft email: {str(e)}")
         return False
 
 
-def log_email(log_file: str, quote_id: Any, vendor_id: Any, status: str, logger: logging.Logger = None) -> None:
+def log_email(log_records: List[Tuple[Any, Any, Any, str]], quote_id: Any, vendor_id: Any, status: str, logger: logging.Logger = None) -> None:
     """
-    Log email creation to CSV file.
+    Record an email creation for the CSV log.
+
+    Records are buffered in log_records and written out by write_email_log.
 
     Args:
-        log_file: Path to the log CSV file
+        log_records: List collecting the log rows of the current run, in
+            EMAIL_LOG_COLUMNS order
         quote_id: ID of the quote
         vendor_id: ID of the vendor
         status: Status of the email (e.g., 'draft_saved', 'error')
     """
-    try:
-        log_df = pd.DataFrame([{
-            'quote_id': quote_id,
-            'vendor_id': vendor_id,
-            'sent_timestamp': pd.Timestamp.now(),
-            'status': status
-        }])
-
-        log_df.to_csv(
-            log_file, 
-            mode='a', 
-            header=not os.path.exists(log_file), 
-            index=False
-        )
+    logger = logger or _default_logger
+    log_records.append((quote_id, vendor_id, pd.Timestamp.now(), status))
 
-        if logger:
-            logger.debug(f"Logged {status} for quote {quote_id}")
-        else:
-            print(f"Logged {status} for quote {quote_id}")
+    logger.debug("Logged %s for quote %s", status, quote_id)
+
+
+def write_email_log(log_file: str, log_records: List[Tuple[Any, Any, Any, str]], logger: logging.Logger = None) -> None:
+    """
+    Append buffered email log records to the log CSV file in a single write.
+
+    Args:
+        log_file: Path to the log CSV file
+        log_records: Log records collected by log_email
+        logger: Optional logger; defaults to the module logger
+    """
+    logger = logger or _default_logger
+    if not log_records:
+        return
+
+    try:
+        with open(log_file, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            # Append mode starts at the end of the file, so an empty position
+            # means a new (or empty) log that still needs its header
+            if f.tell() == 0:
+                writer.writerow(EMAIL_LOG_COLUMNS)
+            writer.writerows(log_records)
 
     except Exception as e:
-        if logger:
-            logger.error(f"Failed to log email: {str(e)}")
-        else:
-            print(f"Failed to log email: {str(e)}")
+        logger.error(f"Failed to log email: {str(e)}")
+
+
+@lru_cache(maxsize=1024)
+def scan_directory(directory: str) -> Dict[str, str]:
+    """
+    List a directory once and classify its entries as files or directories.
+
+    Listings are cached, so any number of path checks in the same folder cost a
+    single os.scandir instead of a stat each (costly on network drives);
+    process_queue clears the cache at the start of every run.
+
+    Args:
+        directory: Directory to list, normalized with os.path.normcase
+
+    Returns:
+        Dictionary mapping each entry's normcase'd name to 'file' or 'dir'; empty
+        if the directory cannot be read
+    """
+    entry_kinds = {}
+    try:
+        with os.scandir(directory or os.curdir) as it:
+            for entry in it:
+                if entry.is_dir():
+                    entry_kinds[os.path.normcase(entry.name)] = 'dir'
+                elif entry.is_file():
+                    entry_kinds[os.path.normcase(entry.name)] = 'file'
+    except OSError:
+        pass
+
+    return entry_kinds
+
+
+def get_path_kind(path: str) -> Optional[str]:
+    """
+    Look up whether a path is a file or a directory in its parent's listing.
+
+    Args:
+        path: Path to check
+
+    Returns:
+        'file' or 'dir', or None if the path does not exist
+    """
+    normalized = os.path.normcase(os.path.normpath(path))
+    name = os.path.basename(normalized)
+
+    # Drive and share roots (and '.' or '..') never appear in a parent's
+    # listing, so check those directly
+    if name in ('', os.curdir, os.pardir):
+        if os.path.isdir(normalized):
+            return 'dir'
+        if os.path.isfile(normalized):
+            return 'file'
+        return None
+
+    return scan_directory(os.path.dirname(normalized)).get(name)
+
+
+def scan_file_paths(paths: Iterable[str]) -> Dict[str, str]:
+    """
+    Classify paths as files or directories with one listing per parent directory.
+
+    Queue items tend to point into a handful of shared folders, so listing each
+    parent once replaces a stat per path with a dictionary lookup.
+
+    Args:
+        paths: File or directory paths to check
+
+    Returns:
+        Dictionary mapping each existing path to 'file' or 'dir'; missing paths
+        are left out
+    """
+    path_kinds = {}
+    for path in paths:
+        path_kind = get_path_kind(path)
+        if path_kind is not None:
+            path_kinds[path] = path_kind
+
+    return path_kinds
+
+
+@lru_cache(maxsize=None)
+def list_tree_files(root: str) -> Tuple[Tuple[str, str, bool], ...]:
+    """
+    List every file under a directory, walking the tree only once per run.
+
+    Queue items of a quote usually share one folder, so the tree is walked once
+    and each part number is then matched against the listing. The tree is
+    walked with os.scandir, whose entries already carry the file type, in the
+    same top-down order as os.walk; symlinked directories are not followed and
+    unreadable directories are skipped. process_queue clears the cache at the
+    start of every run.
+
+    Args:
+        root: Directory to list
+
+    Returns:
+        Tuple of (file name, file path, is an Excel/Word document) for each file
+    """
+    files = []
+    pending_dirs = [root]
+    while pending_dirs:
+        directory = pending_dirs.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.is_file():
+                files.append((entry.name, entry.path, entry.name.lower().endswith(IGNORED_ATTACHMENT_EXTENSIONS)))
+
+        # Reversed so the first sub-folder is listed next, as os.walk would
+        pending_dirs.extend(reversed(subdirs))
+
+    return tuple(files)
+
+
+@lru_cache(maxsize=4096)
+def match_part_files(root: str, part_number: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Match a part number against the file names under a directory.
+
+    A part usually needs several processes, and each process of a quote is
+    searched separately, so the result is cached per folder and part number;
+    process_queue clears the cache at the start of every run.
+
+    Args:
+        root: Directory to search
+        part_number: Part number to look for in file names
+
+    Returns:
+        Tuple containing:
+            - Paths of the matching files to attach
+            - Paths of the matching Excel and Word documents, which are skipped
+    """
+    matches = []
+    ignored = []
+    for name, path, is_ignored in list_tree_files(root):
+        if part_number in name:
+            (ignored if is_ignored else matches).append(path)
+
+    return tuple(matches), tuple(ignored)
+
+
+def iter_part_files(root: str, part_number: str, logger: logging.Logger = None) -> Iterator[str]:
+    """
+    Find the files under a directory whose name contains a part number.
+
+    Excel and Word documents are skipped.
+
+    Args:
+        root: Directory to search
+        part_number: Part number to look for in file names
+        logger: Optional logger; defaults to the module logger
+
+    Yields:
+        Paths of the matching files
+    """
+    logger = logger or _default_logger
+    matches, ignored = match_part_files(root, part_number)
+    # Skip Excel and Word documents
+    for path in ignored:
+        logger.info(f"Ignoring Excel/Word file: {path}")
+
+    yield from matches
+
+
+def collect_attachments(process_items: DataFrame, logger: logging.Logger = None, path_kinds: Optional[Dict[str, str]] = None) -> List[str]:
+    """
+    Collect the files to attach for a group of queue items.
+
+    Each item's file_path may point at a file, which is attached directly, or at
+    a directory, which is searched recursively for files whose name contains the
+    item's part number (Excel and Word documents are skipped).
+
+    Args:
+        process_items: DataFrame containing the items for one quote and process
+        logger: Optional logger; defaults to the module logger
+        path_kinds: Result of scan_file_paths covering the items' file paths;
+            scanned here when not given
+
+    Returns:
+        List of paths of the files to attach, without duplicates
+    """
+    logger = logger or _default_logger
+    if path_kinds is None:
+        path_kinds = scan_file_paths(path for path in process_items['file_path'].unique() if path)
+
+    attachments = []
+    # File paths from the CSV are already stripped by load_data
+    for file_path, part_number in zip(process_items['file_path'], process_items['part_number']):
+        if file_path:
+            # Check if the path exists
+            path_kind = path_kinds.get(file_path)
+            if path_kind is not None:
+                # If it's a directory, search for files containing the part number
+                if path_kind == 'dir':
+                    found_files = False
+                    # Search through all sub-folders
+                    for full_path in iter_part_files(file_path, part_number, logger):
+                        # Add the file to attachments
+                        attachments.append(full_path)
+                        found_files = True
+                        logger.info(f"Found file for part {part_number}: {full_path}")
+
+                    if not found_files:
+                        logger.warning(f"No files found for part {part_number} in directory: {file_path}")
+                # If it's a file, add it directly
+                elif path_kind == 'file':
+                    attachments.append(file_path)
+                    logger.info(f"Using file: {file_path}")
+            else:
+                logger.warning(f"Path not found: {file_path}")
+
+    # Items sharing a drawing or folder would otherwise attach the same file
+    # more than once, each Add copying it into the message store again
+    return list(dict.fromkeys(attachments))
+
+
+def build_process_index(vendor_info: Dict[Any, VendorInfo]) -> Dict[str, List[Any]]:
+    """
+    Build an inverted index from process name to the vendors offering it.
+
+    Args:
+        vendor_info: Dictionary mapping vendor_id to VendorInfo
+
+    Returns:
+        Dictionary mapping lower-cased process name to a list of vendor IDs, in
+        the same order as vendor_info
+    """
+    process_index = {}
+    for vendor_id, info in vendor_info.items():
+        for vendor_process in info.processes:
+            if isinstance(vendor_process, str):
+                process_name = vendor_process
+            elif isinstance(vendor_process, dict) and 'name' in vendor_process:
+                process_name = vendor_process['name']
+            else:
+                continue
+
+            vendor_ids = process_index.setdefault(process_name.lower(), [])
+            # A vendor listing the same process twice is only offered once
+            if not vendor_ids or vendor_ids[-1] != vendor_id:
+                vendor_ids.append(vendor_id)
+
+    return process_index
+
+
+def build_spec_index(vendor_info: Dict[Any, VendorInfo]) -> Dict[str, List[Any]]:
+    """
+    Build an inverted index from spec number to the vendors supporting it.
+
+    Args:
+        vendor_info: Dictionary mapping vendor_id to VendorInfo
+
+    Returns:
+        Dictionary mapping lower-cased spec number to a list of vendor IDs, in
+        the same order as vendor_info
+    """
+    spec_index = {}
+    for vendor_id, info in vendor_info.items():
+        for vendor_process in info.processes:
+            if not isinstance(vendor_process, dict) or vendor_process.get('specs') is None:
+                continue
+
+            for vendor_spec in vendor_process['specs']:
+                if isinstance(vendor_spec, dict) and 'number' in vendor_spec:
+                    vendor_ids = spec_index.setdefault(vendor_spec['number'].lower(), [])
+                    # A vendor listing the same spec under several processes is only offered once
+                    if not vendor_ids or vendor_ids[-1] != vendor_id:
+                        vendor_ids.append(vendor_id)
+
+    return spec_index
 
 
 def process_queue(
     queue: DataFrame, 
-    vendor_info: Dict[Any, Dict[str, Any]], 
+    vendor_info: Dict[Any, VendorInfo], 
     outlook: Any, 
     log_file: str,
     template_path: str = None,
@@ -701,13 +1141,13 @@ def process_queue(
 
     Args:
         queue: DataFrame containing the queue data with renamed columns
-        vendor_info: Dictionary mapping vendor_id to vendor information (email, name, processes)
+        vendor_info: Dictionary mapping vendor_id to VendorInfo
         outlook: Outlook application object
         log_file: Path to the log CSV file
         template_path: Path to the Jinja2 template for email body
         sample_table_path: Path to the sample table template
         signature: Email signature to include
-        logger: Optional logger for logging messages
+        logger: Optional logger; defaults to the module logger
         default_vendor: Default vendor to use if no suitable vendor is found
 
     Returns:
@@ -715,182 +1155,133 @@ def process_queue(
             - Number of successful drafts
             - Total number of quotes processed
     """
+    logger = logger or _default_logger
     successful_drafts = 0
     total_quotes = 0
+    # Resolve the template files once rather than probing the disk for every email
     use_template = template_path is not None and os.path.exists(template_path)
+    sample_header = None
+    if sample_table_path and os.path.exists(sample_table_path):
+        sample_header = read_sample_table_header(sample_table_path)
 
-    # Get a list of unique quote IDs
-    unique_quotes = queue['quote_id'].unique()
-
-    for quote_id in unique_quotes:
-        items = queue[queue['quote_id'] == quote_id]
-
-        # Check if we have any vendor information
-        if not vendor_info:
-            if logger:
-                logger.warning(f"No vendor information available, skipping quote {quote_id}")
-            else:
-                print(f"No vendor information available, skipping quote {quote_id}")
-            continue
+    # Check if we have any vendor information
+    if not vendor_info:
+        for quote_id in queue['quote_id'].unique():
+            logger.warning(f"No vendor information available, skipping quote {quote_id}")
+        return successful_drafts, total_quotes
+
+    # Index vendors by spec and process name once instead of scanning every
+    # vendor for each quote and process
+    spec_index = build_spec_index(vendor_info)
+    process_index = build_process_index(vendor_info)
+
+    # Partition the queue into one group per quote and process in a single pass;
+    # a categorical process column lets the grouping work on integer codes.
+    # Rows are first brought into quote order (stable, by first appearance), so
+    # each quote's processes are handled together even in an unsorted queue.
+    quote_codes, _ = pd.factorize(queue['quote_id'])
+    grouped_items = queue.iloc[quote_codes.argsort(kind='stable')].astype({'process': 'category'}).groupby(
+        ['quote_id', 'process'], sort=False, observed=True
+    )
 
-        # Get the processes needed for this quote
-        processes_needed = items['process'].unique().tolist()
+    # Forget directory listings from any earlier run, then check every
+    # referenced path up front, listing each parent directory once
+    scan_directory.cache_clear()
+    list_tree_files.cache_clear()
+    match_part_files.cache_clear()
+    path_kinds = scan_file_paths(path for path in queue['file_path'].unique() if path)
+
+    # The due date and signature kind are the same for every email of the run
+    due_date = calculate_due_date()
+    signature_is_html = is_html_signature(signature)
+
+    # Log records are buffered for the whole run and written out in one go
+    log_records = []
+
+    # Outlook's COM server is single-threaded, so drafts are created on this
+    # thread; only the folder walks, which wait on the (often network) file
+    # system, run in worker threads, one per distinct folder, while earlier
+    # drafts are being built. Workers are not given their own Outlook dispatch:
+    # calls from another apartment are marshalled back to the same Outlook
+    # process and serialized.
+    walk_pool = ThreadPoolExecutor(max_workers=8)
+    folder_walks = {}
+    pending_groups = []
 
-        # Create a separate email for each process
-        for process in processes_needed:
+    try:
+        # Find the vendors for each process of each quote and start walking the
+        # folders its attachments are searched in
+        for (quote_id, process), process_items in grouped_items:
             total_quotes += 1
-            process_items = items[items['process'] == process]
 
             # Check if we have spec information for this process
-            has_spec = 'spec' in process_items.columns and not process_items['spec'].isna().all()
+            specs = [item_spec for item_spec in process_items['spec'] if item_spec] if 'spec' in process_items.columns else []
+            has_spec = bool(specs)
 
             # Find vendors that can handle this spec or process
             suitable_vendors = []
 
             if has_spec:
                 # Get the spec for this process
-                spec = process_items['spec'].iloc[0]
-                if logger:
-                    logger.info(f"Searching for vendors that support spec: {spec}")
-                else:
-                    print(f"Searching for vendors that support spec: {spec}")
+                spec = specs[0]
+                logger.info(f"Searching for vendors that support spec: {spec}")
 
                 # Find vendors that support this spec
-                for vendor_id, info in vendor_info.items():
-                    if 'processes' not in info:
-                        continue
-
-                    for vendor_process in info['processes']:
-                        if isinstance(vendor_process, dict) and 'specs' in vendor_process and vendor_process['specs'] is not None:
-                            for vendor_spec in vendor_process['specs']:
-                                if isinstance(vendor_spec, dict) and 'number' in vendor_spec:
-                                    if spec.lower() == vendor_spec['number'].lower():
-                                        suitable_vendors.append(vendor_id)
-                                        break
+                suitable_vendors = spec_index.get(spec.lower(), [])
 
             # If no vendors found by spec, try finding by process
             if not suitable_vendors:
                 if has_spec:
-                    if logger:
-                        logger.warning(f"No vendors found supporting spec: {spec}")
-                        logger.info(f"Falling back to searching by process: {process}")
-                    else:
-                        print(f"No vendors found supporting spec: {spec}")
-                        print(f"Falling back to searching by process: {process}")
-
-                for vendor_id, info in vendor_info.items():
-                    # If the vendor has a processes list and the process is in it
-                    if 'processes' in info:
-                        for vendor_process in info['processes']:
-                            if isinstance(vendor_process, str) and process.lower() == vendor_process.lower():
-                                suitable_vendors.append(vendor_id)
-                                break
-                            elif isinstance(vendor_process, dict) and 'name' in vendor_process:
-                                if process.lower() == vendor_process['name'].lower():
-                                    suitable_vendors.append(vendor_id)
-                                    break
+                    logger.warning(f"No vendors found supporting spec: {spec}")
+                    logger.info(f"Falling back to searching by process: {process}")
+
+                suitable_vendors = process_index.get(process.lower(), [])
+
+            # Groups without a suitable vendor are logged as skipped in the
+            # second pass, so the log keeps the order of the queue
+            if not suitable_vendors:
+                pending_groups.append((quote_id, process, process_items, suitable_vendors, []))
+                continue
+
+            group_folders = [path for path in process_items['file_path'].unique() if path_kinds.get(path) == 'dir']
+            for folder in group_folders:
+                if folder not in folder_walks:
+                    folder_walks[folder] = walk_pool.submit(list_tree_files, folder)
+            pending_groups.append((quote_id, process, process_items, suitable_vendors, group_folders))
 
+        # Create a separate email for each process of each quote
+        for quote_id, process, process_items, suitable_vendors, group_folders in pending_groups:
             # If no suitable vendors found, log a warning and skip this item
             if not suitable_vendors:
-                if logger:
-                    logger.error(f"No vendors found with capabilities for process: {process}. Skipping this item.")
-                else:
-                    print(f"No vendors found with capabilities for process: {process}. Skipping this item.")
+                logger.error(f"No vendors found with capabilities for process: {process}. Skipping this item.")
 
                 # Log that we're skipping this item due to no suitable vendor
-                log_email(log_file, quote_id, "NONE", f'skipped_no_vendor_{process}', logger)
+                log_email(log_records, quote_id, "NONE", f'skipped_no_vendor_{process}', logger)
 
                 # Skip to the next process
                 continue
 
+            # Wait for the group's folder listings, then match its part numbers;
+            # the attachments are the same for every vendor of the process
+            for folder in group_folders:
+                folder_walks[folder].result()
+            attachments = collect_attachments(process_items, logger, path_kinds)
+
+            if not attachments:
+                logger.warning(f"No valid attachments found for quote {quote_id}, process {process}")
+
             # Create an email for each suitable vendor
             for vendor_id in suitable_vendors:
-                if logger:
-                    logger.info(f"Processing quote {quote_id}, process {process} for vendor {vendor_id}")
-                else:
-                    print(f"Processing quote {quote_id}, process {process} for vendor {vendor_id}")
+                logger.info(f"Processing quote {quote_id}, process {process} for vendor {vendor_id}")
 
                 # Get vendor info
                 info = vendor_info.get(vendor_id)
                 if not info:
-                    if logger:
-                        logger.warning(f"No contact for vendor {vendor_id}, skipping quote {quote_id}, process {process}")
-                    else:
-                        print(f"No contact for vendor {vendor_id}, skipping quote {quote_id}, process {process}")
-                    log_email(log_file, quote_id, vendor_id, f'skipped_no_contact_{process}', logger)
+                    logger.warning(f"No contact for vendor {vendor_id}, skipping quote {quote_id}, process {process}")
+                    log_email(log_records, quote_id, vendor_id, f'skipped_no_contact_{process}', logger)
                     continue
 
-                recipient = info['email']
-
-                # Get attachment paths
-                attachments = []
-                for r in process_items.itertuples():
-                    if hasattr(r, 'file_path') and pd.notna(r.file_path):
-                        # Handle file paths from the CSV
-                        file_path = r.file_path.strip()
-                        # Convert to raw string to handle special characters
-                        file_path = rf"{file_path}"
-                        part_number = r.part_number.strip()
-
-                        # Check if the path exists
-                        if os.path.exists(file_path):
-                            # If it's a directory, search for files containing the part number
-                            if os.path.isdir(file_path):
-                                found_files = False
-                                # Define file extensions to ignore
-                                ignore_extensions = ['.xlsx', '.xls', '.docx', '.doc']
-
-                                # Use os.walk to search through all sub-folders
-                                for root, dirs, files in os.walk(file_path):
-                                    for file in files:
-                                        # Check if the file contains the part number
-                                        if part_number in file:
-                                            full_path = os.path.join(root, file)
-
-                                            # Check if it's a file and not an Excel or Word document
-                                            if os.path.isfile(full_path):
-                                                # Get the file extension
-                                                _, ext = os.path.splitext(full_path)
-
-                                                # Skip Excel and Word documents
-                                                if ext.lower() in ignore_extensions:
-                                                    if logger:
-                                                        logger.info(f"Ignoring Excel/Word file: {full_path}")
-                                                    else:
-                                                        print(f"Ignoring Excel/Word file: {full_path}")
-                                                    continue
-
-                                                # Add the file to attachments
-                                                attachments.append(full_path)
-                                                found_files = True
-                                                if logger:
-                                                    logger.info(f"Found file for part {part_number}: {full_path}")
-                                                else:
-                                                    print(f"Found file for part {part_number}: {full_path}")
-
-                                if not found_files:
-                                    if logger:
-                                        logger.warning(f"No files found for part {part_number} in directory: {file_path}")
-                                    else:
-                                        print(f"No files found for part {part_number} in directory: {file_path}")
-                            # If it's a file, add it directly
-                            elif os.path.isfile(file_path):
-                                attachments.append(file_path)
-                                if logger:
-                                    logger.info(f"Using file: {file_path}")
-                                else:
-                                    print(f"Using file: {file_path}")
-                        else:
-                            if logger:
-                                logger.warning(f"Path not found: {file_path}")
-                            else:
-                                print(f"Path not found: {file_path}")
-
-                if not attachments:
-                    if logger:
-                        logger.warning(f"No valid attachments found for quote {quote_id}, process {process}")
-                    else:
-                        print(f"No valid attachments found for quote {quote_id}, process {process}")
+                recipient = info.email
 
                 # Build email with actual attachment count
                 subject, body = create_email_body(
@@ -899,10 +1290,12 @@ def process_queue(
                     process=process,
                     use_template=use_template,
                     template_path=template_path,
-                    sample_table_path=sample_table_path,
                     signature=signature,
                     html_format=True,
-                    actual_attachments=attachments
+                    actual_attachments=attachments,
+                    due_date=due_date,
+                    signature_is_html=signature_is_html,
+                    sample_header=sample_header
                 )
 
                 # Create draft
@@ -918,18 +1311,16 @@ def process_queue(
                 )
 
                 if success:
-                    if logger:
-                        logger.info(f"Draft saved for quote {quote_id}, process {process} -> {recipient}")
-                    else:
-                        print(f"Draft saved for quote {quote_id}, process {process} -> {recipient}")
-                    log_email(log_file, quote_id, vendor_id, f'draft_saved_{process}', logger)
+                    logger.info(f"Draft saved for quote {quote_id}, process {process} -> {recipient}")
+                    log_email(log_records, quote_id, vendor_id, f'draft_saved_{process}', logger)
                     successful_drafts += 1
                 else:
-                    if logger:
-                        logger.warning(f"Issues encountered when creating draft for quote {quote_id}, process {process}")
-                    else:
-                        print(f"Issues encountered when creating draft for quote {quote_id}, process {process}")
-                    log_email(log_file, quote_id, vendor_id, f'draft_saved_with_issues_{process}', logger)
+                    logger.warning(f"Issues encountered when creating draft for quote {quote_id}, process {process}")
+                    log_email(log_records, quote_id, vendor_id, f'draft_saved_with_issues_{process}', logger)
+
+    finally:
+        walk_pool.shutdown()
+        write_email_log(log_file, log_records, logger)
 
     return successful_drafts, total_quotes
 
@@ -992,10 +1383,7 @@ Phone: (123) 456-7890
         )
 
         # Report results
-        if logger:
-            logger.info(f"All drafts generated. Success: {successful_drafts}/{total_quotes}")
-        else:
-            print(f"All drafts generated. Success: {successful_drafts}/{total_quotes}")
+        logger.info(f"All drafts generated. Success: {successful_drafts}/{total_quotes}")
 
     except Exception as e:
         # If logger is not defined yet, print to console
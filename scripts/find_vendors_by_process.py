@@ -19,10 +19,16 @@ Requirements:
 import argparse
 import os
 import sys
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
 import yaml
 
+# Use the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 
 def setup_argument_parser() -> argparse.ArgumentParser:
     """
@@ -69,13 +75,35 @@ def load_vendor_options(file_path: str) -> Dict[str, Any]:
         raise FileNotFoundError(f"Vendor options file not found: {file_path}")
 
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            vendor_options = yaml.safe_load(f)
+        with open(file_path, 'rb') as f:
+            vendor_options = yaml.load(f, Loader=SafeLoader)
         return vendor_options
     except yaml.YAMLError as e:
         raise yaml.YAMLError(f"Error parsing YAML file: {str(e)}")
 
 
+def flatten_vendor_options(vendor_options: Dict[str, Any]) -> List[Tuple[int, Dict[str, Any], Dict[str, Any], str]]:
+    """
+    Flatten the vendor options into one row per named vendor process.
+
+    Each row carries the lower-cased process name, so case-insensitive searches
+    don't lower-case it again for every comparison.
+
+    Args:
+        vendor_options: Dictionary containing vendor options data
+
+    Returns:
+        List of tuples containing (vendor index, vendor, process, lower-cased
+        process name), in file order
+    """
+    return [
+        (vendor_index, vendor, process, process['name'].lower())
+        for vendor_index, vendor in enumerate(vendor_options.get('vendors') or [])
+        for process in vendor.get('processes') or []
+        if 'name' in process
+    ]
+
+
 def find_vendors_by_process(
     vendor_options: Dict[str, Any],
     process_name: str,
@@ -93,26 +121,23 @@ def find_vendors_by_process(
         List of vendors that have the specified process capability
     """
     matching_vendors = []
+    matched_vendor_index = None
+    process_name_lower = process_name.lower()
 
-    if 'vendors' not in vendor_options:
-        return matching_vendors
-
-    for vendor in vendor_options['vendors']:
-        if 'processes' not in vendor:
+    # Scan the flat process rows in a single pass; rows of one vendor are
+    # adjacent, so a vendor is skipped once one of its processes matched
+    for vendor_index, vendor, process, name_lower in flatten_vendor_options(vendor_options):
+        if vendor_index == matched_vendor_index:
             continue
 
-        for process in vendor['processes']:
-            if 'name' not in process:
-                continue
-
-            if exact_match:
-                if process['name'] == process_name:
-                    matching_vendors.append(vendor)
-                    break
-            else:
-                if process_name.lower() in process['name'].lower():
-                    matching_vendors.append(vendor)
-                    break
+        if exact_match:
+            matched = process['name'] == process_name
+        else:
+            matched = process_name_lower in name_lower
+
+        if matched:
+            matching_vendors.append(vendor)
+            matched_vendor_index = vendor_index
 
     return matching_vendors
 
@@ -132,6 +157,7 @@ def print_vendor_info(vendors: List[Dict[str, Any]], process_name: str) -> None:
     print(f"Found {len(vendors)} vendor(s) with process capability: {process_name}")
     print("-" * 80)
 
+    process_name_lower = process_name.lower()
     for vendor in vendors:
         print(f"Vendor: {vendor['name']}")
         if 'location' in vendor and vendor['location']:
@@ -141,7 +167,7 @@ def print_vendor_info(vendors: List[Dict[str, Any]], process_name: str) -> None:
         
         # Find the matching process to show its specs
         for process in vendor['processes']:
-            if (process_name.lower() in process['name'].lower()):
+            if process_name_lower in process['name'].lower():
                 print(f"Process: {process['name']}")
                 if 'specs' in process and process['specs']:
                     print("Specifications:")
@@ -17,12 +17,21 @@ Requirements:
 """
 
 import argparse
+import io
+import itertools
 import os
 import sys
-from typing import Dict, List, Any, Optional, Tuple
+from collections import defaultdict
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 
 import yaml
 
+# Use the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 
 def setup_argument_parser() -> argparse.ArgumentParser:
     """
@@ -53,6 +62,12 @@ def setup_argument_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Only show vendors that are familiar with the spec (have familiar: true)",
     )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Stop after this many matching specs (default: show all matches)",
+    )
     return parser
 
 
@@ -74,18 +89,43 @@ def load_vendor_options(file_path: str) -> Dict[str, Any]:
         raise FileNotFoundError(f"Vendor options file not found: {file_path}")
 
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            vendor_options = yaml.safe_load(f)
+        with open(file_path, 'rb') as f:
+            vendor_options = yaml.load(f, Loader=SafeLoader)
         return vendor_options
     except yaml.YAMLError as e:
         raise yaml.YAMLError(f"Error parsing YAML file: {str(e)}")
 
 
+def flatten_vendor_options(vendor_options: Dict[str, Any]) -> Iterator[Tuple[Dict[str, Any], str, Dict[str, Any], str]]:
+    """
+    Flatten the vendor options into one row per numbered vendor spec.
+
+    Each row carries the lower-cased spec number, so case-insensitive searches
+    don't lower-case it again for every comparison. Rows are produced lazily,
+    so a search that stops early doesn't flatten the rest of the file.
+
+    Args:
+        vendor_options: Dictionary containing vendor options data
+
+    Yields:
+        Tuples containing (vendor, process_name, spec, lower-cased spec
+        number), in file order
+    """
+    return (
+        (vendor, process.get('name'), spec, spec['number'].lower())
+        for vendor in vendor_options.get('vendors') or []
+        for process in vendor.get('processes') or []
+        for spec in process.get('specs') or []
+        if 'number' in spec
+    )
+
+
 def find_vendors_by_spec(
     vendor_options: Dict[str, Any],
     spec_number: str,
     exact_match: bool = False,
-    familiar_only: bool = False
+    familiar_only: bool = False,
+    limit: Optional[int] = None
 ) -> List[Tuple[Dict[str, Any], str, Dict[str, Any]]]:
     """
     Find vendors that support a specific specification.
@@ -95,40 +135,30 @@ def find_vendors_by_spec(
         spec_number: Number of the specification to search for
         exact_match: Whether to require an exact match for the spec number
         familiar_only: Whether to only include vendors familiar with the spec
+        limit: Maximum number of matches to return; the search stops as soon
+            as it is reached (default: all matches)
 
     Returns:
         List of tuples containing (vendor, process_name, spec) for each match
     """
-    matching_vendors = []
-
-    if 'vendors' not in vendor_options:
-        return matching_vendors
-
-    for vendor in vendor_options['vendors']:
-        if 'processes' not in vendor:
-            continue
+    spec_number_lower = spec_number.lower()
 
-        for process in vendor['processes']:
-            if 'specs' not in process or not process['specs']:
+    def iter_matches() -> Iterator[Tuple[Dict[str, Any], str, Dict[str, Any]]]:
+        # Scan the flat spec rows in a single pass
+        for vendor, process_name, spec, number_lower in flatten_vendor_options(vendor_options):
+            # Skip if we only want familiar specs and this one isn't
+            if familiar_only and not spec.get('familiar', False):
                 continue
 
-            for spec in process['specs']:
-                if 'number' not in spec:
-                    continue
+            # Check if the spec matches
+            if exact_match:
+                if spec['number'] == spec_number:
+                    yield vendor, process_name, spec
+            else:
+                if spec_number_lower in number_lower:
+                    yield vendor, process_name, spec
 
-                # Skip if we only want familiar specs and this one isn't
-                if familiar_only and not spec.get('familiar', False):
-                    continue
-
-                # Check if the spec matches
-                if exact_match:
-                    if spec['number'] == spec_number:
-                        matching_vendors.append((vendor, process['name'], spec))
-                else:
-                    if spec_number.lower() in spec['number'].lower():
-                        matching_vendors.append((vendor, process['name'], spec))
-
-    return matching_vendors
+    return list(itertools.islice(iter_matches(), limit))
 
 
 def print_vendor_info(matches: List[Tuple[Dict[str, Any], str, Dict[str, Any]]], spec_number: str) -> None:
@@ -144,39 +174,39 @@ def print_vendor_info(matches: List[Tuple[Dict[str, Any], str, Dict[str, Any]]],
         return
 
     # Group matches by vendor
-    vendor_matches = {}
+    vendor_matches = defaultdict(lambda: {'vendor': None, 'processes': []})
     for vendor, process_name, spec in matches:
-        vendor_name = vendor['name']
-        if vendor_name not in vendor_matches:
-            vendor_matches[vendor_name] = {
-                'vendor': vendor,
-                'processes': []
-            }
-        vendor_matches[vendor_name]['processes'].append({
+        entry = vendor_matches[vendor['name']]
+        entry['vendor'] = vendor
+        entry['processes'].append({
             'name': process_name,
             'spec': spec
         })
 
-    print(f"Found {len(vendor_matches)} vendor(s) supporting specification: {spec_number}")
-    print("-" * 80)
+    # Build the report in memory and write it out in one go
+    out = io.StringIO()
+    out.write(f"Found {len(vendor_matches)} vendor(s) supporting specification: {spec_number}\n")
+    out.write("-" * 80 + "\n")
 
     for vendor_name, data in vendor_matches.items():
         vendor = data['vendor']
-        print(f"Vendor: {vendor_name}")
+        out.write(f"Vendor: {vendor_name}\n")
         if 'location' in vendor and vendor['location']:
-            print(f"Location: {vendor['location']}")
+            out.write(f"Location: {vendor['location']}\n")
         if 'website' in vendor and vendor['website']:
-            print(f"Website: {vendor['website']}")
-        
-        print("Processes:")
+            out.write(f"Website: {vendor['website']}\n")
+
+        out.write("Processes:\n")
         for process_data in data['processes']:
             process_name = process_data['name']
             spec = process_data['spec']
             familiar = "Yes" if spec.get('familiar', False) else "No"
-            print(f"  - {process_name}")
-            print(f"    Specification: {spec['number']} (Familiar: {familiar})")
-        
-        print("-" * 80)
+            out.write(f"  - {process_name}\n")
+            out.write(f"    Specification: {spec['number']} (Familiar: {familiar})\n")
+
+        out.write("-" * 80 + "\n")
+
+    sys.stdout.write(out.getvalue())
 
 
 def main() -> None:
@@ -185,6 +215,8 @@ def main() -> None:
         # Parse command line arguments
         parser = setup_argument_parser()
         args = parser.parse_args()
+        if args.limit is not None and args.limit < 1:
+            parser.error("--limit must be a positive integer")
 
         # Determine the path to the vendor_options.yaml file
         if args.yaml_file:
@@ -197,12 +229,13 @@ def main() -> None:
         # Load vendor options
         vendor_options = load_vendor_options(yaml_file)
 
-        # Find vendors by spec
+        # Find vendors by spec, stopping early when a limit was given
         matches = find_vendors_by_spec(
             vendor_options,
             args.spec_number,
             args.exact_match,
-            args.familiar_only
+            args.familiar_only,
+            args.limit
         )
 
         # Print vendor information
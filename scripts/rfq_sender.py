@@ -8,21 +8,28 @@ emails to multiple vendors for finishing, material, and hardware quotes.
 
 import argparse
 import datetime
+import fnmatch
 import logging
+import mimetypes
 import os
-import smtplib
+import re
 import sqlite3
+import stat
 import sys
+import threading
 import time
-from email.mime.application import MIMEApplication
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Optional, Sequence, Tuple, Union
 from dotenv import load_dotenv
 
-import jinja2
-import yaml
+# jinja2, yaml and smtplib are imported where they are used, so commands that
+# don't need them (e.g. show-log) start faster
+if TYPE_CHECKING:
+    import smtplib
+
+    import jinja2
 
 # Load environment variables from .env file
 load_dotenv()
@@ -33,24 +40,48 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 logs_dir = os.path.join(project_root, "logs")
 os.makedirs(logs_dir, exist_ok=True)
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler(os.path.join(logs_dir, "rfq_sender.log")),
-    ],
-)
+# Set up logging, unless the root logger is already configured (e.g. by an
+# importing application or test runner) so the log file is not opened again
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[
+            logging.StreamHandler(sys.stdout),
+            logging.FileHandler(os.path.join(logs_dir, "rfq_sender.log")),
+        ],
+    )
 logger = logging.getLogger("rfq_sender")
 
+# Pattern for validating email addresses
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Maximum number of vendor emails sent at the same time
+MAX_SEND_WORKERS = 8
+
+# CUI protection settings, read once from the environment (after .env is loaded)
+_CUI_ENABLED = os.environ.get("ENABLE_CUI_PROTECTION", "true").lower() == "true"
+_CUI_WARNING = os.environ.get(
+    "CUI_WARNING_TEXT",
+    "This email contains Controlled Unclassified Information (CUI) that is subject to safeguarding or dissemination controls."
+)
+
+# Statement for logging an RFQ, shared by single and batched inserts
+_INSERT_RFQ_SQL = (
+    "INSERT INTO rfq_log (part_no, process, vendor_name, vendor_email, quantities, sent_at, quote_no) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
 
-def parse_args() -> argparse.Namespace:
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
     """
-    Parse command-line arguments.
+    Build the command-line argument parser.
+
+    The parser is built once and reused by later parse_args calls.
 
     Returns:
-        argparse.Namespace: Parsed command-line arguments
+        argparse.ArgumentParser: Configured argument parser
     """
     parser = argparse.ArgumentParser(
         description="Send RFQ emails to vendors for finishing, material, and hardware quotes."
@@ -109,7 +140,41 @@ def parse_args() -> argparse.Namespace:
         help="Number of log entries to show"
     )
 
-    return parser.parse_args()
+    return parser
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command-line arguments.
+
+    Args:
+        argv (Optional[List[str]], optional): Arguments to parse. Defaults to None,
+            which parses sys.argv[1:].
+
+    Returns:
+        argparse.Namespace: Parsed command-line arguments
+    """
+    return _build_parser().parse_args(argv)
+
+
+@lru_cache(maxsize=8)
+def parse_quantities(quantities: str) -> Tuple[int, ...]:
+    """
+    Parse a comma-separated list of quantities.
+
+    Results are cached, so validating and then using the same argument only
+    parses it once.
+
+    Args:
+        quantities (str): Comma-separated list of quantities (e.g. '1,2,5,10')
+
+    Returns:
+        Tuple[int, ...]: Parsed quantities
+
+    Raises:
+        ValueError: If a quantity is not an integer
+    """
+    return tuple(int(q.strip()) for q in quantities.split(","))
 
 
 def validate_args(args: argparse.Namespace) -> Tuple[bool, Optional[str]]:
@@ -136,7 +201,7 @@ def validate_args(args: argparse.Namespace) -> Tuple[bool, Optional[str]]:
 
     # Validate quantities format
     try:
-        quantities = [int(q.strip()) for q in args.quantities.split(",")]
+        quantities = parse_quantities(args.quantities)
         if not quantities:
             return False, "Quantities list cannot be empty"
         if any(q <= 0 for q in quantities):
@@ -147,10 +212,55 @@ def validate_args(args: argparse.Namespace) -> Tuple[bool, Optional[str]]:
     return True, None
 
 
+@lru_cache(maxsize=8)
+def _load_yaml(file_path: str, mtime: float) -> any:
+    """
+    Parse a YAML file, caching the result until the file is modified.
+
+    Args:
+        file_path (str): Path to the YAML file
+        mtime (float): Modification time of the file, part of the cache key
+
+    Returns:
+        any: Parsed YAML data
+    """
+    import yaml
+
+    # Use the libyaml-backed loader when PyYAML was built with it
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml import SafeLoader
+
+    with open(file_path, "rb") as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
+@lru_cache(maxsize=8)
+def _vendor_processes(vendors_file: str, mtime: float) -> Tuple[FrozenSet[str], ...]:
+    """
+    Lower-case each vendor's process names for case-insensitive lookups.
+
+    Args:
+        vendors_file (str): Path to the vendor configuration file
+        mtime (float): Modification time of the file, part of the cache key
+
+    Returns:
+        Tuple[FrozenSet[str], ...]: Lower-cased process names, in vendor order
+    """
+    vendors = _load_yaml(vendors_file, mtime).get("vendors") or []
+    return tuple(frozenset(p.lower() for p in vendor.get("processes", [])) for vendor in vendors)
+
+
 def load_config(config_dir: str) -> dict:
     """
     Load configuration files.
 
+    Parsed files are cached until they are modified, so the returned sections
+    are shared between calls and must not be modified. "vendor_processes"
+    holds each vendor's lower-cased process names, in the same order as the
+    vendor list.
+
     Args:
         config_dir (str): Path to configuration directory
 
@@ -162,38 +272,40 @@ def load_config(config_dir: str) -> dict:
     # Load vendor configuration
     vendors_file = os.path.join(config_dir, "vendors.yml")
     if os.path.exists(vendors_file):
-        with open(vendors_file, "r") as f:
-            config["vendors"] = yaml.safe_load(f)
+        vendors_mtime = os.path.getmtime(vendors_file)
+        config["vendors"] = _load_yaml(vendors_file, vendors_mtime)
+        config["vendor_processes"] = _vendor_processes(vendors_file, vendors_mtime)
     else:
-        logger.error(f"Vendor configuration file not found: {vendors_file}")
+        logger.error("Vendor configuration file not found: %s", vendors_file)
         sys.exit(1)
 
     # Load email configuration
     email_file = os.path.join(config_dir, "email.yml")
     if os.path.exists(email_file):
-        with open(email_file, "r") as f:
-            config["email"] = yaml.safe_load(f)
+        config["email"] = _load_yaml(email_file, os.path.getmtime(email_file))
     else:
-        logger.error(f"Email configuration file not found: {email_file}")
+        logger.error("Email configuration file not found: %s", email_file)
         sys.exit(1)
 
     return config
 
 
-def get_attachments(part_no: str, process: str, file_location: str) -> List[str]:
+@lru_cache(maxsize=64)
+def _attachment_pattern(part_no: str, process: str) -> re.Pattern:
     """
-    Find and retrieve files matching the part number and process.
+    Compile the attachment file name patterns for a part and process.
+
+    The glob patterns are combined into a single regex with one named group
+    per pattern (rank0, rank1, ...), in order of preference. Names are matched
+    with the platform's case rules, as a glob would.
 
     Args:
         part_no (str): Part number
         process (str): Process name
-        file_location (str): Path to directory containing files
 
     Returns:
-        List[str]: List of file paths to attach
+        re.Pattern: Compiled pattern to match against normcase'd file names
     """
-    logger.info(f"Searching for files matching part_no={part_no}, process={process} in {file_location}")
-
     # Normalize process name for matching
     process_norm = process.lower().replace(" ", "").replace("-", "")
 
@@ -204,50 +316,109 @@ def get_attachments(part_no: str, process: str, file_location: str) -> List[str]
         f"*{part_no}*",  # Just part number
     ]
 
-    # Find matching files
-    matching_files = []
-    for pattern in patterns:
-        path = Path(file_location)
-        for file_path in path.glob(pattern):
-            if file_path.is_file() and file_path not in matching_files:
-                matching_files.append(str(file_path))
+    return re.compile("|".join(
+        f"(?P<rank{rank}>{fnmatch.translate(os.path.normcase(pattern))})"
+        for rank, pattern in enumerate(patterns)
+    ))
+
+
+def get_attachments(part_no: str, process: str, file_location: str) -> List[str]:
+    """
+    Find and retrieve files matching the part number and process.
+
+    Args:
+        part_no (str): Part number
+        process (str): Process name
+        file_location (str): Path to directory containing files
+
+    Returns:
+        List[str]: List of file paths to attach
+    """
+    logger.info("Searching for files matching part_no=%s, process=%s in %s", part_no, process, file_location)
+
+    pattern = _attachment_pattern(part_no, process)
+    rank_groups = [name for name in pattern.groupindex if name.startswith("rank")]
+    ranked_files = [[] for _ in rank_groups]
+
+    # Find matching files in a single pass over the directory; files matching
+    # an earlier pattern come first. Hidden files (editor lock files, macOS
+    # "._" resource forks) are never attached.
+    try:
+        with os.scandir(file_location) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+
+                match = pattern.match(os.path.normcase(entry.name))
+                if match is None or not entry.is_file():
+                    continue
+
+                for rank, group in enumerate(rank_groups):
+                    if match.group(group) is not None:
+                        ranked_files[rank].append(entry.path)
+                        break
+    except OSError as e:
+        logger.warning("Could not read file location %s: %s", file_location, e)
+
+    matching_files = [file_path for files in ranked_files for file_path in files]
 
     # Log results
     if matching_files:
-        logger.info(f"Found {len(matching_files)} matching files")
+        logger.info("Found %s matching files", len(matching_files))
         for file_path in matching_files:
-            logger.info(f"  - {file_path}")
+            logger.info("  - %s", file_path)
     else:
-        logger.warning(f"No files found matching part_no={part_no}, process={process}")
+        logger.warning("No files found matching part_no=%s, process=%s", part_no, process)
 
     return matching_files
 
 
-def render_template(template_name: str, context: Dict[str, any]) -> str:
+@lru_cache(maxsize=1)
+def _get_env(template_dir: str) -> "jinja2.Environment":
     """
-    Render a Jinja2 template with the given context.
+    Get the Jinja2 environment for a template directory.
+
+    The environment is built once and reused, so its compiled template cache
+    survives across renders.
 
     Args:
-        template_name (str): Name of the template file
-        context (Dict[str, any]): Context data for template rendering
+        template_dir (str): Path to the template directory
 
     Returns:
-        str: Rendered template as a string
+        jinja2.Environment: Configured Jinja2 environment
     """
-    # Set up Jinja2 environment
-    template_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
+    import jinja2
+
     env = jinja2.Environment(
         loader=jinja2.FileSystemLoader(template_dir),
         autoescape=jinja2.select_autoescape(["html", "xml"]),
         trim_blocks=True,
         lstrip_blocks=True,
+        cache_size=400,
+        auto_reload=False,
     )
 
     # Add custom filters
-    env.filters["basename"] = lambda path: os.path.basename(path)
+    env.filters["basename"] = os.path.basename
+
+    return env
+
+
+def render_template(template_name: str, context: Dict[str, any]) -> str:
+    """
+    Render a Jinja2 template with the given context.
+
+    Args:
+        template_name (str): Name of the template file
+        context (Dict[str, any]): Context data for template rendering
+
+    Returns:
+        str: Rendered template as a string
+    """
+    template_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
 
     # Load and render template
-    template = env.get_template(template_name)
+    template = _get_env(template_dir).get_template(template_name)
     return template.render(**context)
 
 
@@ -266,6 +437,14 @@ def init_database() -> sqlite3.Connection:
     db_path = os.path.join(data_dir, "rfq_log.db")
     conn = sqlite3.connect(db_path)
 
+    # Return rows that can be indexed by column name
+    conn.row_factory = sqlite3.Row
+
+    # Use write-ahead logging and only sync at checkpoints, so logging a batch
+    # of RFQs does not wait on a full fsync per commit
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+
     # Create table if it doesn't exist
     cursor = conn.cursor()
     cursor.execute('''
@@ -285,51 +464,75 @@ def init_database() -> sqlite3.Connection:
     return conn
 
 
+def rfq_log_row(
+    part_no: str,
+    process: str,
+    vendor_name: str,
+    vendor_email: str,
+    quantities: Sequence[int],
+    quote_no: Optional[str] = None,
+) -> Tuple[str, str, str, str, str, str, Optional[str]]:
+    """
+    Build the rfq_log row for an RFQ sent now.
+
+    Args:
+        part_no (str): Part number
+        process (str): Process name
+        vendor_name (str): Vendor name
+        vendor_email (str): Vendor email
+        quantities (Sequence[int]): Quantities
+        quote_no (Optional[str], optional): Quote number. Defaults to None.
+
+    Returns:
+        Tuple[str, str, str, str, str, str, Optional[str]]: Parameters for _INSERT_RFQ_SQL
+    """
+    return (
+        part_no,
+        process,
+        vendor_name,
+        vendor_email,
+        ",".join(map(str, quantities)),
+        datetime.datetime.now().isoformat(),
+        quote_no,
+    )
+
+
 def log_rfq(
     conn: sqlite3.Connection,
     part_no: str,
     process: str,
     vendor_name: str,
     vendor_email: str,
-    quantities: List[int],
+    quantities: Sequence[int],
     quote_no: Optional[str] = None,
 ) -> int:
     """
     Log an RFQ to the database.
 
+    The row is committed immediately. To log many RFQs in one transaction,
+    pass rfq_log_row results to executemany instead (see run).
+
     Args:
         conn (sqlite3.Connection): Database connection
         part_no (str): Part number
         process (str): Process name
         vendor_name (str): Vendor name
         vendor_email (str): Vendor email
-        quantities (List[int]): List of quantities
+        quantities (Sequence[int]): Quantities
         quote_no (Optional[str], optional): Quote number. Defaults to None.
 
     Returns:
         int: ID of the inserted row
     """
-    cursor = conn.cursor()
-    cursor.execute(
-        '''
-        INSERT INTO rfq_log (part_no, process, vendor_name, vendor_email, quantities, sent_at, quote_no)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''',
-        (
-            part_no,
-            process,
-            vendor_name,
-            vendor_email,
-            ",".join(str(q) for q in quantities),
-            datetime.datetime.now().isoformat(),
-            quote_no,
-        ),
-    )
-    conn.commit()
+    with conn:
+        cursor = conn.execute(
+            _INSERT_RFQ_SQL,
+            rfq_log_row(part_no, process, vendor_name, vendor_email, quantities, quote_no),
+        )
     return cursor.lastrowid
 
 
-def show_rfq_log(conn: sqlite3.Connection, limit: int = 10) -> List[Dict[str, any]]:
+def show_rfq_log(conn: sqlite3.Connection, limit: int = 10) -> List[sqlite3.Row]:
     """
     Show recent RFQ log entries.
 
@@ -338,7 +541,7 @@ def show_rfq_log(conn: sqlite3.Connection, limit: int = 10) -> List[Dict[str, an
         limit (int, optional): Maximum number of entries to show. Defaults to 10.
 
     Returns:
-        List[Dict[str, any]]: List of log entries
+        List[sqlite3.Row]: List of log entries, indexable by column name
     """
     cursor = conn.cursor()
     cursor.execute(
@@ -350,14 +553,7 @@ def show_rfq_log(conn: sqlite3.Connection, limit: int = 10) -> List[Dict[str, an
         ''',
         (limit,),
     )
-
-    # Convert to list of dictionaries
-    columns = [col[0] for col in cursor.description]
-    results = []
-    for row in cursor.fetchall():
-        results.append(dict(zip(columns, row)))
-
-    return results
+    return cursor.fetchall()
 
 
 def validate_email(email: str) -> bool:
@@ -370,14 +566,12 @@ def validate_email(email: str) -> bool:
     Returns:
         bool: True if email is valid, False otherwise
     """
-    import re
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return _EMAIL_RE.match(email) is not None
 
 
 def check_attachments(attachments: List[str]) -> Tuple[bool, List[str], List[str]]:
     """
-    Check if attachments exist and are readable.
+    Check if attachments are readable regular files.
 
     Args:
         attachments (List[str]): List of file paths to check
@@ -389,7 +583,13 @@ def check_attachments(attachments: List[str]) -> Tuple[bool, List[str], List[str
     invalid_attachments = []
 
     for file_path in attachments:
-        if os.path.exists(file_path) and os.access(file_path, os.R_OK):
+        # One stat tells both whether the path exists and whether it is a file
+        try:
+            is_file = stat.S_ISREG(os.stat(file_path).st_mode)
+        except OSError:
+            is_file = False
+
+        if is_file and os.access(file_path, os.R_OK):
             valid_attachments.append(file_path)
         else:
             invalid_attachments.append(file_path)
@@ -409,44 +609,124 @@ def handle_cui_compliance(vendor: Dict[str, any], body: str) -> str:
         str: Modified email body with CUI warnings if applicable
     """
     # Check if CUI protection is enabled
-    enable_cui_protection = os.environ.get("ENABLE_CUI_PROTECTION", "true").lower() == "true"
-
-    if not enable_cui_protection:
+    if not _CUI_ENABLED:
         return body
 
     # Check vendor approval level
     approval_level = vendor.get("approval_level", "").lower()
 
-    # If vendor is approved for CUI, add CUI warning
+    # If vendor is approved for CUI, add CUI warning at the top and bottom of the email
     if approval_level == "cui":
-        cui_warning = os.environ.get(
-            "CUI_WARNING_TEXT", 
-            "This email contains Controlled Unclassified Information (CUI) that is subject to safeguarding or dissemination controls."
-        )
+        modified_body = f"{_CUI_WARNING}\n\n{body}\n\n{_CUI_WARNING}"
 
-        # Add warning at the top of the email
-        modified_body = f"{cui_warning}\n\n{body}"
-
-        # Add warning at the bottom of the email
-        modified_body = f"{modified_body}\n\n{cui_warning}"
-
-        logger.info(f"Added CUI warning to email for CUI-approved vendor: {vendor['name']}")
+        logger.info("Added CUI warning to email for CUI-approved vendor: %s", vendor['name'])
         return modified_body
     else:
         # For non-CUI vendors, check if there are any CUI attachments or content
         # This is a placeholder for more sophisticated CUI detection
-        logger.info(f"Vendor {vendor['name']} is not approved for CUI data")
+        logger.info("Vendor %s is not approved for CUI data", vendor['name'])
         return body
 
 
+@dataclass(frozen=True)
+class SmtpConfig:
+    """
+    SMTP settings used for sending, resolved once from the email configuration.
+
+    Attributes:
+        server (str): SMTP server host
+        port (Union[int, str]): SMTP server port, converted to int when connecting
+        use_tls (bool): Whether to upgrade the connection with STARTTLS
+        username (str): Login user name
+        password (str): Login password
+        from_header (str): Value of the From header
+        cc_header (Optional[str]): Value of the Cc header, or None for no CC
+    """
+
+    server: str
+    port: Union[int, str]
+    use_tls: bool
+    username: str
+    password: str
+    from_header: str
+    cc_header: Optional[str] = None
+
+    @classmethod
+    def from_config(cls, config: Dict[str, any]) -> "SmtpConfig":
+        """
+        Build the SMTP settings from the loaded configuration.
+
+        Args:
+            config (Dict[str, any]): Configuration data (see load_config)
+
+        Returns:
+            SmtpConfig: SMTP settings
+        """
+        smtp = config["email"]["smtp"]
+        cc_emails = config["email"]["settings"].get("cc_emails")
+        return cls(
+            server=smtp["server"],
+            port=smtp["port"],
+            use_tls=bool(smtp["use_tls"]),
+            username=smtp["username"],
+            password=smtp["password"],
+            from_header=f"{smtp['from_name']} <{smtp['from_email']}>",
+            cc_header=", ".join(cc_emails.split(",")) if cc_emails else None,
+        )
+
+
+def connect_smtp(server: "smtplib.SMTP", smtp_config: SmtpConfig) -> None:
+    """
+    Connect an SMTP client to the configured server and log in.
+
+    Also used to reconnect a client whose connection was dropped. If any step
+    fails the client is closed, so the next attempt starts a fresh session.
+
+    Args:
+        server (smtplib.SMTP): SMTP client to connect
+        smtp_config (SmtpConfig): SMTP settings
+    """
+    try:
+        # Clients created without a host get it here; starttls() uses it to
+        # verify the server's certificate
+        server._host = smtp_config.server
+        server.connect(smtp_config.server, int(smtp_config.port))
+        server.ehlo()
+        if smtp_config.use_tls:
+            server.starttls()
+        server.login(smtp_config.username, smtp_config.password)
+    except Exception:
+        server.close()
+        raise
+
+
+def _guess_content_type(file_name: str) -> Tuple[str, str]:
+    """
+    Guess the MIME type of an attachment from its file name.
+
+    Args:
+        file_name (str): File name or path
+
+    Returns:
+        Tuple[str, str]: (maintype, subtype), application/octet-stream if unknown
+    """
+    content_type, encoding = mimetypes.guess_type(file_name)
+    if content_type is None or encoding is not None:
+        content_type = "application/octet-stream"
+    maintype, subtype = content_type.split("/", 1)
+    return maintype, subtype
+
+
 def send_email(
     to_email: str,
     subject: str,
     body: str,
     attachments: List[str],
-    config: Dict[str, any],
+    smtp_config: SmtpConfig,
     dry_run: bool = False,
     max_retries: int = 3,
+    server: Optional["smtplib.SMTP"] = None,
+    inline_attachments: Optional[List[Tuple[str, bytes]]] = None,
 ) -> bool:
     """
     Send an email with attachments.
@@ -456,108 +736,306 @@ def send_email(
         subject (str): Email subject
         body (str): Email body (HTML or plain text)
         attachments (List[str]): List of file paths to attach
-        config (Dict[str, any]): Email configuration
+        smtp_config (SmtpConfig): SMTP settings
         dry_run (bool, optional): If True, don't actually send the email. Defaults to False.
         max_retries (int, optional): Maximum number of retry attempts. Defaults to 3.
+        server (Optional[smtplib.SMTP], optional): SMTP client to reuse across
+            calls. It is connected on first use and reconnected if the server
+            drops the connection. Defaults to None, which opens a connection
+            for this email only.
+        inline_attachments (Optional[List[Tuple[str, bytes]]], optional): In-memory
+            attachments as (filename, content) pairs. Defaults to None.
 
     Returns:
         bool: True if email was sent successfully, False otherwise
     """
+    import smtplib
+    from email.message import EmailMessage
+
     # Validate email format
     if not validate_email(to_email):
-        logger.error(f"Invalid email address: {to_email}")
+        logger.error("Invalid email address: %s", to_email)
         return False
 
     # Check attachments
     all_valid, valid_attachments, invalid_attachments = check_attachments(attachments)
     if not all_valid:
-        logger.warning(f"Some attachments are missing or not readable: {invalid_attachments}")
-        logger.warning(f"Proceeding with valid attachments: {valid_attachments}")
+        logger.warning("Some attachments are missing or not readable: %s", invalid_attachments)
+        logger.warning("Proceeding with valid attachments: %s", valid_attachments)
 
     if dry_run:
-        logger.info(f"[DRY RUN] Would send email to: {to_email}")
-        logger.info(f"[DRY RUN] Subject: {subject}")
-        logger.info(f"[DRY RUN] Body: {body[:100]}...")
-        logger.info(f"[DRY RUN] Attachments: {valid_attachments}")
+        logger.info("[DRY RUN] Would send email to: %s", to_email)
+        logger.info("[DRY RUN] Subject: %s", subject)
+        logger.info("[DRY RUN] Body: %s...", body[:100])
+        inline_names = [filename for filename, _ in inline_attachments or []]
+        logger.info("[DRY RUN] Attachments: %s", valid_attachments + inline_names)
         return True
 
     # Retry logic
     for attempt in range(1, max_retries + 1):
         try:
             # Create message
-            msg = MIMEMultipart()
+            msg = EmailMessage()
             msg["Subject"] = subject
-            msg["From"] = f"{config['email']['smtp']['from_name']} <{config['email']['smtp']['from_email']}>"
+            msg["From"] = smtp_config.from_header
             msg["To"] = to_email
 
             # Add CC recipients if specified
-            if config["email"]["settings"].get("cc_emails"):
-                cc_emails = config["email"]["settings"]["cc_emails"].split(",")
-                msg["Cc"] = ", ".join(cc_emails)
+            if smtp_config.cc_header:
+                msg["Cc"] = smtp_config.cc_header
 
             # Add body
-            msg.attach(MIMEText(body, "plain"))
+            msg.set_content(body)
 
             # Add attachments
             for file_path in valid_attachments:
                 try:
+                    maintype, subtype = _guess_content_type(file_path)
                     with open(file_path, "rb") as f:
-                        attachment = MIMEApplication(f.read())
-                        attachment.add_header(
-                            "Content-Disposition",
-                            f"attachment; filename={os.path.basename(file_path)}",
+                        msg.add_attachment(
+                            f.read(),
+                            maintype=maintype,
+                            subtype=subtype,
+                            filename=os.path.basename(file_path),
                         )
-                        msg.attach(attachment)
                 except Exception as e:
-                    logger.error(f"Failed to attach file {file_path}: {str(e)}")
+                    logger.error("Failed to attach file %s: %s", file_path, e)
+
+            for filename, content in inline_attachments or []:
+                maintype, subtype = _guess_content_type(filename)
+                msg.add_attachment(content, maintype=maintype, subtype=subtype, filename=filename)
 
             # Send email
-            with smtplib.SMTP(config["email"]["smtp"]["server"], int(config["email"]["smtp"]["port"])) as server:
-                if config["email"]["smtp"]["use_tls"]:
-                    server.starttls()
-                server.login(
-                    config["email"]["smtp"]["username"],
-                    config["email"]["smtp"]["password"],
-                )
+            if server is None:
+                with smtplib.SMTP() as smtp_server:
+                    connect_smtp(smtp_server, smtp_config)
+                    smtp_server.send_message(msg)
+            else:
+                # smtplib drops the socket when the server disconnects, so
+                # this also reconnects a shared client on retry
+                if server.sock is None:
+                    connect_smtp(server, smtp_config)
                 server.send_message(msg)
 
-            logger.info(f"Email sent successfully to {to_email}")
+            logger.info("Email sent successfully to %s", to_email)
             return True
 
         except smtplib.SMTPServerDisconnected as e:
-            logger.warning(f"SMTP server disconnected (attempt {attempt}/{max_retries}): {str(e)}")
+            logger.warning("SMTP server disconnected (attempt %s/%s): %s", attempt, max_retries, e)
             if attempt < max_retries:
                 time.sleep(2 ** attempt)  # Exponential backoff
             else:
-                logger.error(f"Failed to send email after {max_retries} attempts")
+                logger.error("Failed to send email after %s attempts", max_retries)
                 return False
 
         except smtplib.SMTPException as e:
-            logger.warning(f"SMTP error (attempt {attempt}/{max_retries}): {str(e)}")
+            logger.warning("SMTP error (attempt %s/%s): %s", attempt, max_retries, e)
+            # Drop the session so the next attempt reconnects and logs in again
+            if server is not None:
+                server.close()
             if attempt < max_retries:
                 time.sleep(2 ** attempt)  # Exponential backoff
             else:
-                logger.error(f"Failed to send email after {max_retries} attempts")
+                logger.error("Failed to send email after %s attempts", max_retries)
                 return False
 
         except Exception as e:
-            logger.error(f"Failed to send email to {to_email}: {str(e)}")
+            logger.error("Failed to send email to %s: %s", to_email, e)
             return False
 
 
-def main():
-    """Main entry point for the script."""
+def process_vendor(
+    vendor: Dict[str, any],
+    email_context: Dict[str, any],
+    subject: str,
+    smtp_config: SmtpConfig,
+    dry_run: bool = False,
+    server: Optional["smtplib.SMTP"] = None,
+) -> bool:
+    """
+    Render and send the RFQ email for a single vendor.
+
+    Args:
+        vendor (Dict[str, any]): Vendor information
+        email_context (Dict[str, any]): Vendor-independent template context
+        subject (str): Email subject, without the CUI indicator
+        smtp_config (SmtpConfig): SMTP settings
+        dry_run (bool, optional): If True, don't actually send the email. Defaults to False.
+        server (Optional[smtplib.SMTP], optional): SMTP client to reuse. Defaults to None.
+
+    Returns:
+        bool: True if email was sent successfully, False otherwise
+    """
+    # Add vendor to context
+    context = {**email_context, "vendor": vendor}
+
+    # Render templates
+    cover_letter = render_template("cover_letter.j2", context)
+    pricing_form = render_template("pricing_form.j2", context)
+
+    # Apply CUI compliance handling to the cover letter
+    cover_letter = handle_cui_compliance(vendor, cover_letter)
+
+    # Attach the pricing form straight from memory
+    pricing_form_name = f"pricing_form_{email_context['part_no']}_{vendor['name'].replace(' ', '_')}.md"
+
+    # Add CUI indicator to subject if vendor has CUI approval
+    if vendor.get("approval_level", "").lower() == "cui":
+        subject = f"[CUI] {subject}"
+
+    return send_email(
+        vendor["email"],
+        subject,
+        cover_letter,
+        email_context["attachments"],
+        smtp_config,
+        dry_run,
+        server=server,
+        inline_attachments=[(pricing_form_name, pricing_form.encode("utf-8"))],
+    )
+
+
+def run(
+    part_no: str,
+    process: str,
+    file_location: str,
+    quantities: Sequence[int],
+    spec: Optional[str] = None,
+    dry_run: bool = False,
+    config_dir: str = os.path.join("..", "config"),
+) -> int:
+    """
+    Send RFQ emails to every vendor that supports a process.
+
+    This is the entry point for callers that already have the arguments as
+    Python values; main() is a thin command-line wrapper around it. The
+    arguments are expected to be valid (see validate_args).
+
+    Args:
+        part_no (str): Part number
+        process (str): Process name
+        file_location (str): Path to directory containing files to attach
+        quantities (Sequence[int]): Quantities
+        spec (Optional[str], optional): Specification details. Defaults to None.
+        dry_run (bool, optional): If True, don't actually send the emails. Defaults to False.
+        config_dir (str, optional): Path to configuration directory. Defaults to ../config.
+
+    Returns:
+        int: Number of emails sent
+
+    Raises:
+        ValueError: If no vendor supports the process
+        SystemExit: If a configuration file is missing
+    """
+    # Load configuration
+    config = load_config(config_dir)
+
+    # Get attachments
+    attachments = get_attachments(part_no, process, file_location)
+
+    # Get matching vendors for the process
+    process_lc = process.lower()
+    matching_vendors = [
+        vendor for vendor, processes in zip(config["vendors"]["vendors"], config["vendor_processes"])
+        if process_lc in processes
+    ]
+
+    if not matching_vendors:
+        raise ValueError(f"No vendors found for process: {process}")
+
+    logger.info("Found %s vendors for process: %s", len(matching_vendors), process)
+
+    # Prepare email context
+    settings = config["email"]["settings"]
+    email_context = {
+        "part_no": part_no,
+        "process": process,
+        "spec": spec,
+        "quantities": quantities,
+        "attachments": attachments,
+        "sender_name": config["email"]["smtp"]["from_name"],
+        "sender_email": config["email"]["smtp"]["from_email"],
+        "company_name": settings.get("company_name", "Your Company"),
+        "due_date": (datetime.datetime.now() + datetime.timedelta(days=7)).strftime("%Y-%m-%d"),
+    }
+
+    # Resolve the vendor-independent email settings once
+    subject = f"{settings.get('subject_prefix', '[RFQ]')} {part_no} - {process}"
+    smtp_config = SmtpConfig.from_config(config)
+
+    import smtplib
+
+    # Send emails to each vendor; sending waits on the network, so vendors
+    # are handled in parallel and the results are logged from this thread.
+    # Each worker thread keeps one SMTP connection for all of its vendors.
+    smtp_clients = threading.local()
+    open_clients = []
+
+    def send_to_vendor(vendor: Dict[str, any]) -> bool:
+        server = getattr(smtp_clients, "server", None)
+        if server is None and not dry_run:
+            server = smtp_clients.server = smtplib.SMTP()
+            open_clients.append(server)
+        return process_vendor(vendor, email_context, subject, smtp_config, dry_run, server)
 
     # Initialize database
     conn = init_database()
 
+    success_count = 0
+    log_rows = []
+    try:
+        with ThreadPoolExecutor(max_workers=min(MAX_SEND_WORKERS, len(matching_vendors))) as executor:
+            futures = {executor.submit(send_to_vendor, vendor): vendor for vendor in matching_vendors}
+            for future in as_completed(futures):
+                vendor = futures[future]
+                if future.result():
+                    success_count += 1
+
+                    # Record the RFQ for the database
+                    if not dry_run:
+                        log_rows.append(rfq_log_row(
+                            part_no,
+                            process,
+                            vendor["name"],
+                            vendor["email"],
+                            quantities,
+                        ))
+    finally:
+        # Log all sent RFQs to the database in a single transaction
+        if log_rows:
+            with conn:
+                conn.executemany(_INSERT_RFQ_SQL, log_rows)
+            logger.info("Logged %s RFQs to database", len(log_rows))
+
+        # Close the SMTP connections
+        for server in open_clients:
+            try:
+                server.quit()
+            except smtplib.SMTPException:
+                server.close()
+
+        # Close database connection
+        conn.close()
+
+    # Log results
+    logger.info("Sent %s of %s RFQ emails", success_count, len(matching_vendors))
+
+    logger.info("RFQ processing completed")
+
+    return success_count
+
+
+def main():
+    """Main entry point for the script."""
+
     # Parse and validate arguments
     args = parse_args()
 
     # Handle subcommands
     if args.command == "show-log":
         # Show recent RFQ log entries
-        logger.info(f"Showing last {args.limit} log entries")
+        logger.info("Showing last %s log entries", args.limit)
+        conn = init_database()
         log_entries = show_rfq_log(conn, args.limit)
 
         if not log_entries:
@@ -583,108 +1061,25 @@ def main():
     # Validate arguments
     is_valid, error_message = validate_args(args)
     if not is_valid:
-        logger.error(f"Invalid arguments: {error_message}")
-        sys.exit(1)
-
-    # Load configuration
-    config = load_config(args.config_dir)
-
-    # Get attachments
-    attachments = get_attachments(args.part_no, args.process, args.file_location)
-
-    # Parse quantities
-    quantities = [int(q.strip()) for q in args.quantities.split(",")]
-
-    # Get matching vendors for the process
-    matching_vendors = []
-    for vendor in config["vendors"]["vendors"]:
-        if args.process.lower() in [p.lower() for p in vendor.get("processes", [])]:
-            matching_vendors.append(vendor)
-
-    if not matching_vendors:
-        logger.warning(f"No vendors found for process: {args.process}")
+        logger.error("Invalid arguments: %s", error_message)
         sys.exit(1)
 
-    logger.info(f"Found {len(matching_vendors)} vendors for process: {args.process}")
-
-    # Prepare email context
-    email_context = {
-        "part_no": args.part_no,
-        "process": args.process,
-        "spec": args.spec,
-        "quantities": quantities,
-        "attachments": attachments,
-        "sender_name": config["email"]["smtp"]["from_name"],
-        "sender_email": config["email"]["smtp"]["from_email"],
-        "company_name": config["email"]["settings"].get("company_name", "Your Company"),
-        "due_date": (datetime.datetime.now() + datetime.timedelta(days=7)).strftime("%Y-%m-%d"),
-    }
-
-    # Send emails to each vendor
-    success_count = 0
-    for vendor in matching_vendors:
-        # Add vendor to context
-        context = {**email_context, "vendor": vendor}
-
-        # Render templates
-        cover_letter = render_template("cover_letter.j2", context)
-        pricing_form = render_template("pricing_form.j2", context)
+    # Parse quantities (already parsed and cached by validate_args)
+    quantities = parse_quantities(args.quantities)
 
-        # Apply CUI compliance handling to the cover letter
-        cover_letter = handle_cui_compliance(vendor, cover_letter)
-
-        # Create pricing form file
-        pricing_form_path = os.path.join(
-            "temp",
-            f"pricing_form_{args.part_no}_{vendor['name'].replace(' ', '_')}.md"
+    try:
+        run(
+            args.part_no,
+            args.process,
+            args.file_location,
+            quantities,
+            spec=args.spec,
+            dry_run=args.dry_run,
+            config_dir=args.config_dir,
         )
-        os.makedirs("temp", exist_ok=True)
-        with open(pricing_form_path, "w") as f:
-            f.write(pricing_form)
-
-        # Add pricing form to attachments
-        all_attachments = attachments + [pricing_form_path]
-
-        # Send email
-        subject = f"{config['email']['settings'].get('subject_prefix', '[RFQ]')} {args.part_no} - {args.process}"
-
-        # Add CUI indicator to subject if vendor has CUI approval
-        if vendor.get("approval_level", "").lower() == "cui":
-            subject = f"[CUI] {subject}"
-
-        if send_email(
-            vendor["email"],
-            subject,
-            cover_letter,
-            all_attachments,
-            config,
-            args.dry_run,
-        ):
-            success_count += 1
-
-            # Log to database
-            if not args.dry_run:
-                log_rfq(
-                    conn,
-                    args.part_no,
-                    args.process,
-                    vendor["name"],
-                    vendor["email"],
-                    quantities,
-                )
-                logger.info(f"Logged RFQ to database for vendor: {vendor['name']}")
-
-        # Clean up temporary file
-        if os.path.exists(pricing_form_path) and not args.dry_run:
-            os.remove(pricing_form_path)
-
-    # Log results
-    logger.info(f"Sent {success_count} of {len(matching_vendors)} RFQ emails")
-
-    # Close database connection
-    conn.close()
-
-    logger.info("RFQ processing completed")
+    except ValueError as e:
+        logger.warning("%s", e)
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,11 @@
+"""
+Shared pytest configuration for the RFQ Sender tests.
+
+Makes the scripts directory importable so tests can import rfq_sender directly.
+"""
+
+import os
+import sys
+
+# Add scripts directory to path to import rfq_sender
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "scripts")))
@@ -5,19 +5,31 @@ This module contains tests for the core functionality of the RFQ Sender system.
 """
 
 import os
-import sys
-import tempfile
 import argparse
+import smtplib
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
+from jinja2 import DictLoader, Environment
 
-# Add parent directory to path to import rfq_sender
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "scripts")))
 import rfq_sender
 
 
+@pytest.fixture(scope="session")
+def shared_tmp(tmp_path_factory):
+    """Temporary root shared by all tests in the session."""
+    return tmp_path_factory.mktemp("rfq_tests")
+
+
+@pytest.fixture
+def temp_dir(shared_tmp, request):
+    """Empty directory for the current test inside the shared temporary root."""
+    path = shared_tmp / request.node.name
+    path.mkdir()
+    return path
+
+
 def test_validate_email():
     """Test email validation function."""
     # Valid emails
@@ -32,40 +44,37 @@ def test_validate_email():
     assert rfq_sender.validate_email("test.example.com") is False
 
 
-def test_check_attachments():
+def test_check_attachments(temp_dir):
     """Test attachment checking function."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Create test files
-        valid_file1 = os.path.join(temp_dir, "valid1.txt")
-        valid_file2 = os.path.join(temp_dir, "valid2.txt")
-        with open(valid_file1, "w") as f:
-            f.write("Test file 1")
-        with open(valid_file2, "w") as f:
-            f.write("Test file 2")
-
-        # Non-existent file
-        invalid_file = os.path.join(temp_dir, "invalid.txt")
-
-        # Test with all valid files
-        all_valid, valid_attachments, invalid_attachments = rfq_sender.check_attachments(
-            [valid_file1, valid_file2]
-        )
-        assert all_valid is True
-        assert len(valid_attachments) == 2
-        assert len(invalid_attachments) == 0
-
-        # Test with mixed valid and invalid files
-        all_valid, valid_attachments, invalid_attachments = rfq_sender.check_attachments(
-            [valid_file1, invalid_file]
-        )
-        assert all_valid is False
-        assert len(valid_attachments) == 1
-        assert len(invalid_attachments) == 1
-        assert valid_attachments[0] == valid_file1
-        assert invalid_attachments[0] == invalid_file
-
-
-def test_get_attachments() -> None:
+    # Create test files
+    valid_file1 = os.path.join(temp_dir, "valid1.txt")
+    valid_file2 = os.path.join(temp_dir, "valid2.txt")
+    Path(valid_file1).write_bytes(b"x")
+    Path(valid_file2).write_bytes(b"x")
+
+    # Non-existent file
+    invalid_file = os.path.join(temp_dir, "invalid.txt")
+
+    # Test with all valid files
+    all_valid, valid_attachments, invalid_attachments = rfq_sender.check_attachments(
+        [valid_file1, valid_file2]
+    )
+    assert all_valid is True
+    assert len(valid_attachments) == 2
+    assert len(invalid_attachments) == 0
+
+    # Test with mixed valid and invalid files
+    all_valid, valid_attachments, invalid_attachments = rfq_sender.check_attachments(
+        [valid_file1, invalid_file]
+    )
+    assert all_valid is False
+    assert len(valid_attachments) == 1
+    assert len(invalid_attachments) == 1
+    assert valid_attachments[0] == valid_file1
+    assert invalid_attachments[0] == invalid_file
+
+
+def test_get_attachments(temp_dir) -> None:
     """
     Test file attachment retrieval function.
 
@@ -75,249 +84,289 @@ def test_get_attachments() -> None:
     Returns:
         None
     """
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Create test files
-        part_no = "0250-20000"
-        process = "cleaning"
-
-        # Files that should match different patterns
-        # Pattern 1: Exact match with part number and process
-        exact_match_file = os.path.join(temp_dir, f"{part_no}_{process}.pdf")
-
-        # Pattern 2: Match with part number and normalized process
-        # Test with spaces and hyphens that should be normalized
-        normalized_process = "clean ing-process"
-        normalized_match_file = os.path.join(
-            temp_dir, 
-            f"{part_no}_{normalized_process}.pdf"
-        )
-
-        # Pattern 3: Match with just the part number
-        part_only_match_file = os.path.join(temp_dir, f"{part_no}_drawing.pdf")
+    # Create test files
+    part_no = "0250-20000"
+    process = "cleaning"
+
+    # Files that should match different patterns
+    # Pattern 1: Exact match with part number and process
+    exact_match_file = os.path.join(temp_dir, f"{part_no}_{process}.pdf")
+
+    # Pattern 2: Match with part number and normalized process
+    # Test with spaces and hyphens that should be normalized
+    normalized_process = "clean ing-process"
+    normalized_match_file = os.path.join(
+        temp_dir, 
+        f"{part_no}_{normalized_process}.pdf"
+    )
+
+    # Pattern 3: Match with just the part number
+    part_only_match_file = os.path.join(temp_dir, f"{part_no}_drawing.pdf")
+
+    # Files that should not match
+    non_matching_file = os.path.join(temp_dir, "other_part.pdf")
+    hidden_file = os.path.join(temp_dir, f"._{part_no}_drawing.pdf")
+
+    # Create all the test files
+    test_files = [
+        exact_match_file, 
+        normalized_match_file, 
+        part_only_match_file, 
+        non_matching_file,
+        hidden_file
+    ]
+    for file_path in test_files:
+        Path(file_path).write_bytes(b"x")
+
+    # Test attachment retrieval
+    with patch("rfq_sender.logger"):  # Mock logger to avoid logging during tests
+        attachments = rfq_sender.get_attachments(part_no, process, temp_dir)
+
+        # Check that all expected files are included
+        assert exact_match_file in attachments
+        assert normalized_match_file in attachments
+        assert part_only_match_file in attachments
+        assert non_matching_file not in attachments
+        assert hidden_file not in attachments
+
+        # Check that files matching several patterns are only returned once
+        assert len(attachments) == len(set(attachments))
+
+
+def test_render_template(monkeypatch):
+    """Test template rendering function."""
+    env = Environment(loader=DictLoader({"test.j2": "Hello, {{ name }}!"}))
+    monkeypatch.setattr(rfq_sender, "_get_env", lambda template_dir: env)
 
-        # Files that should not match
-        non_matching_file = os.path.join(temp_dir, "other_part.pdf")
+    # Test template rendering
+    result = rfq_sender.render_template("test.j2", {"name": "World"})
 
-        # Create all the test files
-        test_files = [
-            exact_match_file, 
-            normalized_match_file, 
-            part_only_match_file, 
-            non_matching_file
-        ]
-        for file_path in test_files:
-            with open(file_path, "w") as f:
-                f.write("Test file")
+    # Check that the template was rendered correctly
+    assert result == "Hello, World!"
 
-        # Test attachment retrieval
-        with patch("rfq_sender.logger"):  # Mock logger to avoid logging during tests
-            attachments = rfq_sender.get_attachments(part_no, process, temp_dir)
 
-            # Check that all expected files are included
-            # Note: The function may return duplicates due to multiple pattern matches
-            assert exact_match_file in attachments
-            assert normalized_match_file in attachments
-            assert part_only_match_file in attachments
-            assert non_matching_file not in attachments
+def test_render_template_compiles_once(temp_dir, monkeypatch):
+    """Test that repeated renders reuse the environment and compiled template."""
+    # Check that the real factory returns one shared environment per directory
+    template_dir = str(temp_dir)
+    assert rfq_sender._get_env(template_dir) is rfq_sender._get_env(template_dir)
 
+    env = Environment(loader=DictLoader({"t.j2": "{{ x }}"}))
+    monkeypatch.setattr(rfq_sender, "_get_env", lambda template_dir: env)
 
-def test_render_template():
-    """Test template rendering function."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Create a test template
-        template_dir = os.path.join(temp_dir, "templates")
-        os.makedirs(template_dir)
+    # Count template source loads
+    calls = []
+    get_source = env.loader.get_source
 
-        test_template = os.path.join(template_dir, "test.j2")
-        with open(test_template, "w") as f:
-            f.write("Hello, {{ name }}!")
+    def counting_get_source(*args):
+        calls.append(args)
+        return get_source(*args)
 
-        # Mock the jinja2 environment
-        mock_env = MagicMock()
-        mock_template = MagicMock()
-        mock_template.render.return_value = "Hello, World!"
-        mock_env.get_template.return_value = mock_template
+    monkeypatch.setattr(env.loader, "get_source", counting_get_source)
 
-        with patch("jinja2.Environment", return_value=mock_env):
-            with patch("os.path.dirname", return_value=temp_dir):
-                # Test template rendering
-                result = rfq_sender.render_template("test.j2", {"name": "World"})
+    for i in range(100):
+        assert rfq_sender.render_template("t.j2", {"x": i}) == str(i)
 
-                # Check that the template was rendered correctly
-                assert result == "Hello, World!"
-                mock_env.get_template.assert_called_once_with("test.j2")
-                mock_template.render.assert_called_once_with(name="World")
+    # Check that the template was only loaded and compiled once
+    assert len(calls) == 1
 
 
 def test_cli_argument_parsing():
     """Test command-line argument parsing."""
-    # Test with required arguments
-    with patch("sys.argv", [
-        "rfq_sender.py",
+    required_args = [
         "--part_no", "0250-20000",
         "--process", "cleaning",
         "--file_location", "path/to/files",
-        "--quantities", "1,2,5,10"
-    ]):
-        args = rfq_sender.parse_args()
+        "--quantities", "1,2,5,10",
+    ]
 
-        # Check required arguments
-        assert args.part_no == "0250-20000"
-        assert args.process == "cleaning"
-        assert args.file_location == "path/to/files"
-        assert args.quantities == "1,2,5,10"
+    # Test with required arguments
+    args = rfq_sender.parse_args(required_args)
 
-        # Check default values for optional arguments
-        assert args.spec is None
-        assert args.dry_run is False
+    # Check required arguments
+    assert args.part_no == "0250-20000"
+    assert args.process == "cleaning"
+    assert args.file_location == "path/to/files"
+    assert args.quantities == "1,2,5,10"
+
+    # Check default values for optional arguments
+    assert args.spec is None
+    assert args.dry_run is False
 
     # Test with optional arguments
-    with patch("sys.argv", [
-        "rfq_sender.py",
-        "--part_no", "0250-20000",
-        "--process", "cleaning",
-        "--file_location", "path/to/files",
-        "--quantities", "1,2,5,10",
-        "--spec", "Special instructions",
-        "--dry-run"
-    ]):
-        args = rfq_sender.parse_args()
+    args = rfq_sender.parse_args(required_args + ["--spec", "Special instructions", "--dry-run"])
 
-        # Check optional arguments
-        assert args.spec == "Special instructions"
-        assert args.dry_run is True
+    # Check optional arguments
+    assert args.spec == "Special instructions"
+    assert args.dry_run is True
 
-    # Test with subcommand
-    with patch("sys.argv", [
-        "rfq_sender.py",
-        "--part_no", "0250-20000",  # Required arguments must be provided
-        "--process", "cleaning",
-        "--file_location", "path/to/files",
-        "--quantities", "1,2,5,10",
-        "show-log",  # Subcommand
-        "--limit", "5"
-    ]):
-        args = rfq_sender.parse_args()
+    # Test with subcommand (required arguments must be provided)
+    args = rfq_sender.parse_args(required_args + ["show-log", "--limit", "5"])
 
-        # Check subcommand and its arguments
-        assert args.command == "show-log"
-        assert args.limit == 5
+    # Check subcommand and its arguments
+    assert args.command == "show-log"
+    assert args.limit == 5
 
+    # Test that sys.argv is still used by default
+    with patch("sys.argv", ["rfq_sender.py"] + required_args):
+        args = rfq_sender.parse_args()
+        assert args.part_no == "0250-20000"
 
-def test_validate_args():
+
+@pytest.mark.parametrize(
+    "override, expected_valid, expected_message",
+    [
+        pytest.param({}, True, None, id="valid"),
+        pytest.param({"part_no": ""}, False, "Part number cannot be empty", id="empty-part-no"),
+        pytest.param({"part_no": "   "}, False, "Part number cannot be empty", id="whitespace-part-no"),
+        pytest.param({"process": ""}, False, "Process cannot be empty", id="empty-process"),
+        pytest.param({"process": "   "}, False, "Process cannot be empty", id="whitespace-process"),
+        pytest.param({"file_location": "non_existent"}, False, "does not exist", id="missing-file-location"),
+        pytest.param({"quantities": ""}, False, "Quantities must be comma-separated integers", id="empty-quantities"),
+        pytest.param(
+            {"quantities": "1,2,abc,10"}, False, "Quantities must be comma-separated integers",
+            id="non-integer-quantities",
+        ),
+        pytest.param({"quantities": "1,2,-5,10"}, False, "Quantities must be positive integers", id="negative-quantities"),
+        pytest.param({"quantities": "1,0,5,10"}, False, "Quantities must be positive integers", id="zero-quantities"),
+    ],
+)
+def test_validate_args(temp_dir, override, expected_valid, expected_message):
     """Test argument validation function."""
-    # Create a temporary directory for testing file_location validation
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Test with valid arguments
-        valid_args = argparse.Namespace(
-            part_no="0250-20000",
-            process="cleaning",
-            file_location=temp_dir,
-            quantities="1,2,5,10"
-        )
-        is_valid, error_message = rfq_sender.validate_args(valid_args)
-        assert is_valid is True
+    fields = {
+        "part_no": "0250-20000",
+        "process": "cleaning",
+        "file_location": "",
+        "quantities": "1,2,5,10",
+        **override,
+    }
+    # file_location is relative to the test's temporary directory
+    fields["file_location"] = os.path.join(temp_dir, fields["file_location"])
+
+    is_valid, error_message = rfq_sender.validate_args(argparse.Namespace(**fields))
+    assert is_valid is expected_valid
+    if expected_message is None:
         assert error_message is None
-
-        # Test with empty part_no
-        invalid_args = argparse.Namespace(
-            part_no="",
-            process="cleaning",
-            file_location=temp_dir,
-            quantities="1,2,5,10"
-        )
-        is_valid, error_message = rfq_sender.validate_args(invalid_args)
-        assert is_valid is False
-        assert "Part number cannot be empty" in error_message
-
-        # Test with whitespace part_no
-        invalid_args = argparse.Namespace(
-            part_no="   ",
-            process="cleaning",
-            file_location=temp_dir,
-            quantities="1,2,5,10"
-        )
-        is_valid, error_message = rfq_sender.validate_args(invalid_args)
-        assert is_valid is False
-        assert "Part number cannot be empty" in error_message
-
-        # Test with empty process
-        invalid_args = argparse.Namespace(
-            part_no="0250-20000",
-            process="",
-            file_location=temp_dir,
-            quantities="1,2,5,10"
+    else:
+        assert expected_message in error_message
+
+
+def test_send_email_reconnects_after_failed_login():
+    """Test that a shared SMTP client starts a fresh session after a failed login."""
+    class FakeSMTP:
+        """Minimal SMTP client whose first login fails."""
+
+        def __init__(self):
+            self.sock = None
+            self.logins = 0
+            self.sent = []
+
+        def connect(self, host, port):
+            self.sock = object()
+
+        def ehlo(self):
+            pass
+
+        def starttls(self):
+            pass
+
+        def login(self, username, password):
+            self.logins += 1
+            if self.logins == 1:
+                raise smtplib.SMTPAuthenticationError(454, b"Temporary failure")
+
+        def close(self):
+            self.sock = None
+
+        def send_message(self, msg):
+            assert self.sock is not None
+            self.sent.append(msg)
+
+    smtp_config = rfq_sender.SmtpConfig(
+        server="smtp.example.com",
+        port=587,
+        use_tls=True,
+        username="user",
+        password="secret",
+        from_header="Sender <sender@example.com>",
+    )
+    server = FakeSMTP()
+
+    with patch("rfq_sender.time.sleep"), patch("rfq_sender.logger"):
+        result = rfq_sender.send_email(
+            "vendor@example.com", "Subject", "Body", [], smtp_config, server=server
         )
-        is_valid, error_message = rfq_sender.validate_args(invalid_args)
-        assert is_valid is False
-        assert "Process cannot be empty" in error_message
-
-        # Test with whitespace process
-        invalid_args = argparse.Namespace(
-            part_no="0250-20000",
-            process="   ",
-            file_location=temp_dir,
-            quantities="1,2,5,10"
-        )
-        is_valid, error_message = rfq_sender.validate_args(invalid_args)
-        assert is_valid is False
-        assert "Process cannot be empty" in error_message
-
-        # Test with non-existent file_location
-        invalid_args = argparse.Namespace(
-            part_no="0250-20000",
-            process="cleaning",
-            file_location=os.path.join(temp_dir, "non_existent"),
-            quantities="1,2,5,10"
-        )
-        is_valid, error_message = rfq_sender.validate_args(invalid_args)
-        assert is_valid is False
-        assert "does not exist" in error_message
-
-        # Test with empty quantities
-        invalid_args = argparse.Namespace(
-            part_no="0250-20000",
-            process="cleaning",
-            file_location=temp_dir,
-            quantities=""
-        )
-        is_valid, error_message = rfq_sender.validate_args(invalid_args)
-        assert is_valid is False
-        assert "Quantities must be comma-separated integers" in error_message
-
-        # Test with non-integer quantities
-        invalid_args = argparse.Namespace(
-            part_no="0250-20000",
-            process="cleaning",
-            file_location=temp_dir,
-            quantities="1,2,abc,10"
-        )
-        is_valid, error_message = rfq_sender.validate_args(invalid_args)
-        assert is_valid is False
-        assert "Quantities must be comma-separated integers" in error_message
-
-        # Test with negative quantities
-        invalid_args = argparse.Namespace(
-            part_no="0250-20000",
-            process="cleaning",
-            file_location=temp_dir,
-            quantities="1,2,-5,10"
-        )
-        is_valid, error_message = rfq_sender.validate_args(invalid_args)
-        assert is_valid is False
-        assert "Quantities must be positive integers" in error_message
-
-        # Test with zero quantities
-        invalid_args = argparse.Namespace(
-            part_no="0250-20000",
-            process="cleaning",
-            file_location=temp_dir,
-            quantities="1,0,5,10"
+
+    # Check that the retry logged in again before sending
+    assert result is True
+    assert server.logins == 2
+    assert len(server.sent) == 1
+
+
+def test_send_email_starttls_uses_server_hostname():
+    """Test that STARTTLS verifies the certificate against the configured server."""
+
+    class FakeContext:
+        """SSL context that records the host name the socket is wrapped for."""
+
+        def __init__(self):
+            self.server_hostname = None
+
+        def wrap_socket(self, sock, server_hostname=None):
+            if not server_hostname:
+                raise ValueError("server_hostname cannot be an empty string")
+            self.server_hostname = server_hostname
+            return sock
+
+    class FakeSMTP(smtplib.SMTP):
+        """SMTP client that runs smtplib's real starttls() without a network."""
+
+        def __init__(self):
+            super().__init__()
+            self.sent = []
+
+        def connect(self, host="localhost", port=0, source_address=None):
+            self.sock = object()
+            return 220, b"Ready"
+
+        def ehlo(self, name=""):
+            self.ehlo_resp = b"smtp.example.com"
+            self.esmtp_features = {"starttls": ""}
+            self.does_esmtp = True
+            return 250, self.ehlo_resp
+
+        def docmd(self, cmd, args=""):
+            return 220, b"Ready to start TLS"
+
+        def login(self, user, password, *, initial_response_ok=True):
+            return 235, b"Authenticated"
+
+        def send_message(self, msg, *args, **kwargs):
+            self.sent.append(msg)
+
+        def close(self):
+            self.sock = None
+
+    smtp_config = rfq_sender.SmtpConfig(
+        server="smtp.example.com",
+        port=587,
+        use_tls=True,
+        username="user",
+        password="secret",
+        from_header="Sender <sender@example.com>",
+    )
+    server = FakeSMTP()
+    context = FakeContext()
+
+    with patch("ssl._create_stdlib_context", return_value=context), patch("rfq_sender.logger"):
+        result = rfq_sender.send_email(
+            "vendor@example.com", "Subject", "Body", [], smtp_config, server=server
         )
-        is_valid, error_message = rfq_sender.validate_args(invalid_args)
-        assert is_valid is False
-        assert "Quantities must be positive integers" in error_message
 
+    # Check that the TLS socket was wrapped for the configured server
+    assert result is True
+    assert context.server_hostname == "smtp.example.com"
+    assert len(server.sent) == 1
 
 if __name__ == "__main__":
     pytest.main()